@@ -0,0 +1,45 @@
+"""
+Benchmark the vectorized price/RAM/SSD parsers against the row-wise ones.
+
+Run from the project root:  python benchmarks/bench_clean_parsers.py
+"""
+from pathlib import Path
+import sys
+import timeit
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core import data_io  # noqa: E402
+from core.distinct import clear_distinct_caches  # noqa: E402
+
+PARSERS = [
+    ("price", data_io.clean_price, data_io.clean_price_series),
+    ("ram", data_io.clean_ram_value, data_io.clean_ram_series),
+    ("ssd", data_io.clean_ssd_value, data_io.clean_ssd_series),
+]
+
+
+def main(repeat: int = 5) -> None:
+    raw = data_io._load_single_csv(data_io.ALL_DATA_FILE)
+    print(f"{data_io.ALL_DATA_FILE.name}: {len(raw)} rows")
+
+    for column, scalar_func, vector_func in PARSERS:
+        pd.testing.assert_series_equal(
+            raw[column].apply(scalar_func), vector_func(raw[column]), check_names=False
+        )
+        row_wise = min(timeit.repeat(lambda: raw[column].apply(scalar_func), number=1, repeat=repeat))
+        # The vectorized parsers keep a persistent distinct-value cache; clear
+        # it on every run so the timing covers parsing, not cache hits.
+        vectorized = min(
+            timeit.repeat(lambda: (clear_distinct_caches(), vector_func(raw[column])), number=1, repeat=repeat)
+        )
+        print(
+            f"{column:>5}: apply {row_wise * 1000:7.1f} ms | vectorized {vectorized * 1000:7.1f} ms"
+            f" | x{row_wise / vectorized:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Bitmap index over the filterable catalog attributes.
+
+Every filter the app applies (brand, OS, RAM/SSD thresholds, dGPU/CUDA flags,
+usage presets) is a boolean vector over the rows of one frame. BitmapIndex
+computes each vector once, keeps it read-only, and hands it out on every
+later query. Callers combine vectors with & and |, and only select rows from
+the frame once, at the end.
+
+Vectors are built lazily on first use; precompute builds the common ones
+up front. The comparisons use the frame's own column dtypes, so a vector is
+identical to the boolean Series the equivalent pandas expression would give.
+
+Range queries on a numeric column (the budget on price) go through a sorted
+permutation instead: two searchsorted calls return the matching row positions
+as a slice of the permutation. The prepared catalog stores the price
+permutation (add_sort_order), so it is not re-sorted per process.
+"""
+from typing import Callable, Dict, Hashable, Iterable, Mapping, Sequence, Set, Tuple
+import threading
+import numpy as np
+import pandas as pd
+
+# Distinct-value vectors built by precompute.
+INDEXED_COLUMNS = ("brand", "os")
+# Thresholds of the sidebar sliders plus the ones the usage presets use.
+THRESHOLDS: Dict[str, Sequence[float]] = {
+    "ram_gb": (4, 8, 12, 16, 20, 24, 28, 32, 36, 40, 44, 48, 52, 56, 60, 64),
+    "ssd_gb": tuple(range(128, 2049, 128)),
+}
+FLAG_COLUMNS = ("has_dgpu", "is_cuda")
+# Columns whose sorted permutation the prepared catalog stores as "<column>_order".
+ORDERED_COLUMNS = ("price",)
+
+
+def order_column(column: str) -> str:
+    """Name of the column holding the sorted permutation of column."""
+    return f"{column}_order"
+
+
+def sort_order(values: pd.Series) -> np.ndarray:
+    """Stable ascending permutation of a numeric column, missing values last."""
+    return np.argsort(values.to_numpy(dtype=np.float64, na_value=np.nan), kind="stable")
+
+
+def add_sort_order(df: pd.DataFrame, columns: Iterable[str] = ORDERED_COLUMNS) -> pd.DataFrame:
+    """Add the "<column>_order" permutation columns (in place); valid only for this exact row set."""
+    for column in columns:
+        if column in df.columns:
+            df[order_column(column)] = sort_order(df[column])
+    return df
+
+
+class BitmapIndex:
+    """Cached boolean row vectors for one DataFrame."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._vectors: Dict[Hashable, np.ndarray] = {}
+        self._indexed_columns: Set[str] = set()
+        self._orders: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    def has(self, column: str) -> bool:
+        """True when the indexed frame has the column."""
+        return column in self._df.columns
+
+    def cached(self, key: Hashable, build: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return the vector stored under key, building and storing it on first use."""
+        with self._lock:
+            vector = self._vectors.get(key)
+        if vector is None:
+            vector = np.asarray(build(), dtype=bool)
+            vector.flags.writeable = False
+            with self._lock:
+                vector = self._vectors.setdefault(key, vector)
+        return vector
+
+    def all(self) -> np.ndarray:
+        """Vector selecting every row."""
+        return self.cached(("all",), lambda: np.ones(len(self._df), dtype=bool))
+
+    def _series_vector(self, key: Hashable, build: Callable[[pd.Series], pd.Series], column: str) -> np.ndarray:
+        return self.cached(key, lambda: build(self._df[column]).to_numpy(dtype=bool))
+
+    def _index_column(self, column: str) -> None:
+        """Build the vectors of every distinct value of column in one pass."""
+        with self._lock:
+            if column in self._indexed_columns:
+                return
+        codes, uniques = pd.factorize(self._df[column])
+        for code, value in enumerate(uniques):
+            self.cached(("==", column, value), lambda code=code: codes == code)
+        with self._lock:
+            self._indexed_columns.add(column)
+
+    def equals(self, column: str, value: Hashable) -> np.ndarray:
+        """Rows whose column equals value (missing values never match)."""
+        self._index_column(column)
+        return self.cached(("==", column, value), lambda: np.zeros(len(self._df), dtype=bool))
+
+    def isin(self, column: str, values: Iterable[Hashable]) -> np.ndarray:
+        """Rows whose column is one of values (missing values never match)."""
+        vector = np.zeros(len(self._df), dtype=bool)
+        for value in values:
+            vector |= self.equals(column, value)
+        return vector
+
+    def at_least(self, column: str, threshold: float) -> np.ndarray:
+        """Rows with column >= threshold; missing values never match."""
+        return self._series_vector((">=", column, threshold), lambda series: series >= threshold, column)
+
+    def at_most(self, column: str, threshold: float) -> np.ndarray:
+        """Rows with column <= threshold; missing values never match."""
+        return self._series_vector(("<=", column, threshold), lambda series: series <= threshold, column)
+
+    def flag(self, column: str) -> np.ndarray:
+        """Rows where a boolean column is set."""
+        return self._series_vector(("flag", column), lambda series: series.astype(bool), column)
+
+    def where(self, column: str, predicate: Callable[[object], bool]) -> np.ndarray:
+        """Rows where predicate(value) holds, evaluated once per distinct value."""
+        def build() -> np.ndarray:
+            codes, uniques = pd.factorize(self._df[column].astype(object), use_na_sentinel=True)
+            results = np.array([bool(predicate(value)) for value in uniques] + [False], dtype=bool)
+            if (codes < 0).any():
+                results[-1] = bool(predicate(self._df[column][codes < 0].iloc[0]))
+            return results[codes]
+
+        return self.cached(("where", column, predicate), build)
+
+    def _sorted(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(permutation, sorted values) of column; the stored permutation is used when it fits the frame."""
+        with self._lock:
+            cached = self._orders.get(column)
+        if cached is not None:
+            return cached
+
+        values = self._df[column].to_numpy()
+        order = None
+        if order_column(column) in self._df.columns:
+            stored = self._df[order_column(column)].to_numpy()
+            # A subset of the catalog keeps the column but not the row positions it refers to.
+            if (
+                len(stored) == len(values)
+                and (len(stored) == 0 or (stored.min() >= 0 and stored.max() < len(values)))
+                and np.bincount(stored, minlength=len(values)).max(initial=0) <= 1
+            ):
+                order = stored.astype(np.intp)
+                ordered = values[order]
+                present = ordered[~np.isnan(ordered)]
+                if np.isnan(ordered[: len(present)]).any() or (np.diff(present) < 0).any():
+                    order = None
+        if order is None:
+            order = sort_order(self._df[column])
+        order.flags.writeable = False
+        ordered = values[order]
+        ordered.flags.writeable = False
+        with self._lock:
+            return self._orders.setdefault(column, (order, ordered))
+
+    def between(self, column: str, low: float, high: float) -> np.ndarray:
+        """
+        Positions of rows with low <= column <= high, in column order.
+
+        The result is a read-only slice of the cached permutation, found with
+        two binary searches; missing values never match.
+        """
+        order, ordered = self._sorted(column)
+        start = np.searchsorted(ordered, low, side="left")
+        stop = np.searchsorted(ordered, high, side="right")
+        return order[start:max(start, stop)]
+
+    def select(self, vector: np.ndarray) -> pd.DataFrame:
+        """Materialize the rows of a combined vector."""
+        return self._df[vector]
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """Materialize the rows at the given positions, in that order."""
+        return self._df.iloc[positions]
+
+    def precompute(
+        self,
+        columns: Iterable[str] = INDEXED_COLUMNS,
+        thresholds: Mapping[str, Sequence[float]] = THRESHOLDS,
+        flags: Iterable[str] = FLAG_COLUMNS,
+    ) -> "BitmapIndex":
+        """Build the distinct-value, threshold and flag vectors of the given columns."""
+        for column in columns:
+            if self.has(column):
+                self._index_column(column)
+        for column, values in thresholds.items():
+            if self.has(column):
+                for value in values:
+                    self.at_least(column, value)
+        for column in flags:
+            if self.has(column):
+                self.flag(column)
+        return self
+
+    def stats(self) -> Dict[str, int]:
+        """Number of stored vectors and their total size in bytes."""
+        with self._lock:
+            vectors = list(self._vectors.values())
+        return {"vectors": len(vectors), "bytes": int(sum(vector.nbytes for vector in vectors))}
@@ -0,0 +1,287 @@
+"""
+Prepared catalog: the cleaned and scored laptop frame the app serves.
+
+Preparing the catalog (clean_data plus CPU/GPU scoring) dominates cold start,
+so the result is persisted as a versioned artifact keyed by the source data
+hash and the scoring table hash. The app loads it directly while the key
+still matches and rebuilds it otherwise.
+
+The artifact is an uncompressed Arrow IPC file that every process memory-maps
+read-only, so app processes on one host share the same page-cache pages
+instead of each holding a private copy of the catalog.
+"""
+from datetime import datetime
+from typing import Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from core import scoring
+from core.bitmap import add_sort_order
+from core.distinct import drop_distinct_caches, map_distinct
+from core.entities import add_product_ids
+from core.data_io import (
+    DATA_DIR,
+    load_data,
+    clean_data,
+    compact_dtypes,
+    source_data_hash,
+    debug_data_inventory,
+    _record_memory_usage,
+)
+
+# Bump when prepare_catalog's logic changes in a way the key cannot detect.
+CATALOG_VERSION = 10
+# The app recommends current products, so history rows stay out of the catalog.
+CATALOG_LOAD_MODE = "latest"
+CATALOG_FILE = DATA_DIR / "prepared_catalog.arrow"
+CATALOG_META_FILE = DATA_DIR / "prepared_catalog.json"
+# Name prefix of the distinct-value caches score_hardware keys on the scoring table hash.
+SCORING_CACHE_PREFIX = "scoring."
+# Below this many raw rows clean_and_score stays serial; pool start-up and
+# pickling the partitions cost more than they save on small frames.
+PARALLEL_MIN_ROWS = 50_000
+
+LAST_CATALOG_STATUS: str = "not_loaded"
+
+
+def catalog_key(source_hash: Optional[str] = None) -> str:
+    """Combine catalog version, load mode, source data hash and scoring table hash into one key."""
+    source_hash = source_hash or source_data_hash()
+    payload = f"{CATALOG_VERSION}:{CATALOG_LOAD_MODE}:{source_hash}:{scoring.scoring_tables_hash()}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def score_hardware(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add cpu_model, cpu_score, gpu_model, gpu_norm, gpu_score, the
+    query-independent scoring.STATIC_FEATURE_COLUMNS, the per-profile
+    scoring.DEV_FIT_COLUMNS and the budget-independent
+    scoring.PARTIAL_SCORE_COLUMNS to a cleaned frame (in place) and return it.
+
+    Each distinct CPU/GPU string is parsed once by the model resolver; the
+    canonical id, label and score all come from that parse. The distinct-value
+    caches are named after the scoring table hash, so results computed with
+    older tables are never reused; the caches of older hashes are dropped.
+    """
+    scoring.sync_model_resolver()
+    tables_hash = scoring.scoring_tables_hash()
+    drop_distinct_caches(
+        lambda name: name.startswith(SCORING_CACHE_PREFIX) and not name.endswith(f":{tables_hash}")
+    )
+
+    def by_model(series: pd.Series, func) -> pd.Series:
+        return map_distinct(series, func, name=f"{SCORING_CACHE_PREFIX}{func.__name__}:{tables_hash}")
+
+    if "cpu" in df.columns:
+        df["cpu_model"] = by_model(df["cpu"], scoring.cpu_model_id)
+        df["cpu_score"] = by_model(df["cpu"], scoring.get_cpu_score)
+    else:
+        df["cpu_model"] = scoring.CPU_MISSING_ID
+        df["cpu_score"] = 5.0
+
+    if "gpu" in df.columns:
+        df["gpu_model"] = by_model(df["gpu"], scoring.gpu_model_id)
+        df["gpu_norm"] = by_model(df["gpu"], scoring.normalize_gpu_model)
+        df["gpu_score"] = by_model(df["gpu"], scoring.gpu_model_score)
+    else:
+        df["gpu_score"] = 3.0
+        df["gpu_model"] = "integrated-generic"
+        df["gpu_norm"] = "Integrated (generic)"
+
+    scoring.add_static_features(df)
+    scoring.add_dev_fit_columns(df)
+    return scoring.add_partial_score_columns(df)
+
+
+def _clean_and_score_part(part: pd.DataFrame) -> pd.DataFrame:
+    """Worker entry point: clean one partition and score it."""
+    return score_hardware(clean_data(part))
+
+
+def clean_and_score(
+    df: pd.DataFrame,
+    max_workers: Optional[int] = None,
+    min_rows: int = PARALLEL_MIN_ROWS,
+) -> pd.DataFrame:
+    """
+    clean_data plus score_hardware, split across a process pool for large frames.
+
+    The frame is cut into contiguous partitions, one per worker, and the
+    results are concatenated in partition order with a fresh RangeIndex, so
+    the output equals the serial path. Frames shorter than min_rows, or
+    max_workers=1, run serially in this process.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, max(1, len(df) // max(1, min_rows // 2)))
+    if workers <= 1 or len(df) < min_rows:
+        return _clean_and_score_part(df)
+
+    bounds = np.linspace(0, len(df), workers + 1, dtype=int)
+    parts = [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_clean_and_score_part, parts))
+
+    return pd.concat(results, ignore_index=True)
+
+
+def prepare_catalog(df: pd.DataFrame, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Clean the raw frame, add cpu_score, gpu_norm and gpu_score, resolve
+    cross-store product_id/store_count, compact dtypes and store the price
+    permutation used for budget range queries (bitmap.add_sort_order).
+
+    Entity resolution runs on the whole frame after the parallel step, since
+    listings of one product can land in different partitions.
+    """
+    return add_sort_order(compact_dtypes(add_product_ids(clean_and_score(df, max_workers=max_workers))))
+
+
+def _write_catalog_file(df: pd.DataFrame) -> None:
+    """
+    Publish the catalog as an uncompressed Arrow IPC file.
+
+    The file is written under a temporary name and renamed into place, so
+    processes that still map the previous version keep a consistent view.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    CATALOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CATALOG_FILE.with_name(f".{CATALOG_FILE.name}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, CATALOG_FILE)
+
+
+def _map_catalog_file() -> pd.DataFrame:
+    """
+    Memory-map the catalog file read-only and wrap it without copying.
+
+    Numeric columns and (with pandas' Arrow-backed strings) text columns point
+    straight into the mapping, so the returned frame must be treated as read-only.
+    """
+    source = pa.memory_map(str(CATALOG_FILE), "r")
+    table = ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def process_memory_report() -> Dict[str, int]:
+    """
+    Return this process' resident memory in kB (VmRSS, RssAnon, RssFile).
+
+    RssFile covers the shared catalog mapping; RssAnon is private memory.
+    Empty on platforms without /proc.
+    """
+    report: Dict[str, int] = {}
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as file:
+            for line in file:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile"):
+                    report[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return report
+
+
+def _read_catalog_meta() -> Optional[Dict[str, object]]:
+    """Read the catalog metadata file; return None when missing or unreadable."""
+    try:
+        with open(CATALOG_META_FILE, "r", encoding="utf-8") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def build_prepared_catalog(use_cache: bool = True, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Load, prepare and persist the catalog under its current key.
+
+    Returns the prepared frame; an empty frame is returned (and nothing is
+    written) when no source data could be loaded.
+    """
+    global LAST_CATALOG_STATUS
+
+    raw_df = load_data(use_cache=use_cache, mode=CATALOG_LOAD_MODE)
+    if raw_df is None or raw_df.empty:
+        LAST_CATALOG_STATUS = "No source data, catalog not built"
+        return pd.DataFrame()
+
+    source_hash = source_data_hash()
+    prepared = prepare_catalog(raw_df, max_workers=max_workers)
+
+    meta = {
+        "version": CATALOG_VERSION,
+        "key": catalog_key(source_hash),
+        "source_hash": source_hash,
+        "scoring_hash": scoring.scoring_tables_hash(),
+        "load_mode": CATALOG_LOAD_MODE,
+        "memory_usage": debug_data_inventory()["memory_usage"],
+        "unresolved_models": scoring.unresolved_models(prepared),
+        "rows": int(len(prepared)),
+        "built_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    try:
+        _write_catalog_file(prepared)
+        with open(CATALOG_META_FILE, "w", encoding="utf-8") as file:
+            json.dump(meta, file, indent=2)
+        # Serve the mapped file so this process shares pages with the others too.
+        prepared = _map_catalog_file()
+        LAST_CATALOG_STATUS = f"Built catalog with {len(prepared)} rows"
+    except Exception as exc:
+        # A failed write only costs the next cold start; serve the frame anyway.
+        LAST_CATALOG_STATUS = f"Built catalog with {len(prepared)} rows (not persisted: {exc})"
+
+    return prepared
+
+
+def load_prepared_catalog() -> pd.DataFrame:
+    """Return the persisted catalog when its key matches, otherwise rebuild it."""
+    global LAST_CATALOG_STATUS
+
+    meta = _read_catalog_meta()
+    if meta is not None and CATALOG_FILE.exists():
+        try:
+            if meta.get("key") == catalog_key():
+                prepared = _map_catalog_file()
+                _record_memory_usage(meta.get("memory_usage") or {})
+                LAST_CATALOG_STATUS = f"Loaded {len(prepared)} rows from prepared catalog"
+                return prepared
+        except Exception:
+            pass
+
+    return build_prepared_catalog()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the prepared laptop catalog artifact.")
+    parser.add_argument(
+        "--force", action="store_true", help="Rebuild even when the stored key still matches."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes for cleaning and scoring."
+    )
+    parser.add_argument(
+        "--memory", action="store_true", help="Print this process' resident memory after loading."
+    )
+    args = parser.parse_args()
+
+    if args.force:
+        build_prepared_catalog(max_workers=args.workers)
+    else:
+        load_prepared_catalog()
+    print(LAST_CATALOG_STATUS)
+    if args.memory:
+        report = process_memory_report()
+        print(", ".join(f"{key}: {value} kB" for key, value in report.items()) or "Memory report unavailable")
+
+
+if __name__ == "__main__":
+    main()
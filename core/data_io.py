@@ -1,10 +1,33 @@
 from pathlib import Path
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-import pickle
+import csv
+import hashlib
+import json
+import os
 import re
+import time
+
+from core.distinct import distinct_cache_stats
+from core.specs import (
+    OS_FIELD_RULES,
+    OS_NAME_RULES,
+    clean_price,
+    clean_price_series,
+    clean_ram_series,
+    clean_ram_value,
+    clean_ssd_series,
+    clean_ssd_value,
+    detect_os,
+    detect_os_series,
+    parse_screen_size,
+    parse_screen_size_series,
+)
+from core.history import SCRAPED_AT_FORMAT, read_history, write_snapshot
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
@@ -15,25 +38,127 @@ DATA_FILES = [
     DATA_DIR / "incehesap_laptops.csv",
     DATA_DIR / "vatan_laptops.csv",
 ]
-CACHE_FILE = DATA_DIR / "laptop_cache.pkl"
+CACHE_FILE = DATA_DIR / "laptop_cache.parquet"
+CACHE_MANIFEST_FILE = DATA_DIR / "laptop_cache.manifest.json"
+CACHE_VERSION = 4
 ALL_DATA_FILE = DATA_DIR / "all_data.csv"
+# Cleaned rows keyed by raw-row hash, used by clean_data(incremental=True).
+CLEAN_STORE_DIR = DATA_DIR / "clean_store"
+CLEAN_STORE_VERSION = 2
+ROW_HASH_COLUMN = "_row_hash"
 
 LAST_STATUS: str = "not_loaded"
 _LAST_FOUND_FILES: List[Path] = []
-_LAST_LOADED_FILES: Dict[str, int] = {}
+_LAST_LOADED_FILES: Dict[str, Dict[str, object]] = {}
+_LAST_CACHE_MANIFEST: Dict[str, object] = {}
+_LAST_MEMORY_USAGE: Dict[str, object] = {}
+_LAST_INCREMENTAL_CLEAN: Dict[str, int] = {}
+
+# Low-cardinality text columns stored as categoricals by compact_dtypes.
+CATEGORY_COLUMNS = ["brand", "os", "source", "gpu_norm", "cpu", "gpu", "ram", "ssd", "cpu_suffix", "cpu_model", "gpu_model"]
+
+
+_STORE_COLUMNS = ["url", "name", "price", "screen_size", "ssd", "cpu", "ram", "os", "gpu"]
+_TEXT_DTYPES = {column: str for column in _STORE_COLUMNS if column != "price"}
+
+# Known scraper outputs: dialect, encoding, dtypes and columns, so they parse in
+# one pass with the C engine. Unknown files go through _sniff_delimiter instead.
+CSV_SCHEMAS: Dict[str, Dict[str, object]] = {
+    "amazon_laptops.csv": {
+        "sep": ",",
+        "encoding": "utf-8",
+        "usecols": _STORE_COLUMNS,
+        "dtype": {**_TEXT_DTYPES, "price": "float64"},
+    },
+    "mediamarkt_laptops.csv": {
+        "sep": ",",
+        "encoding": "utf-8-sig",
+        "usecols": _STORE_COLUMNS,
+        "dtype": {**_TEXT_DTYPES, "price": "float64"},
+    },
+    "incehesap_laptops.csv": {
+        "sep": ",",
+        "encoding": "utf-8-sig",
+        "usecols": _STORE_COLUMNS,
+        "dtype": {
+            **_TEXT_DTYPES,
+            "price": "float64",
+            "screen_size": "float64",
+            "ssd": "float64",
+            "ram": "float64",
+        },
+    },
+    "vatan_laptops.csv": {
+        "sep": ",",
+        "encoding": "utf-8-sig",
+        "usecols": _STORE_COLUMNS,
+        "dtype": {**_TEXT_DTYPES, "price": "float64"},
+    },
+    "all_data.csv": {
+        "sep": ",",
+        "encoding": "utf-8-sig",
+        "usecols": _STORE_COLUMNS + ["scraped_at", "source"],
+        "dtype": {**_TEXT_DTYPES, "price": "float64", "scraped_at": str, "source": str},
+    },
+}
+
+# Files at least this large go to the process pool when load_data(use_processes=True).
+PROCESS_POOL_MIN_BYTES = 8 * 1024 * 1024
+
+# Default rows per chunk for the streaming clean pipeline.
+CHUNK_ROWS = 5000
+
+# load_data modes: every row from every file, the latest snapshot per source,
+# or the latest row per product URL.
+LOAD_MODES = ("all", "latest", "latest_url")
+
+SNIFF_SAMPLE_BYTES = 16 * 1024
+_SNIFFED_DIALECTS: Dict[str, str] = {}
+
+
+def _read_known_csv(path: Path, schema: Dict[str, object]) -> Optional[pd.DataFrame]:
+    """Read a registered CSV in a single C-engine pass; None if it no longer fits the schema."""
+    try:
+        return pd.read_csv(
+            path,
+            sep=schema["sep"],
+            encoding=schema["encoding"],
+            usecols=schema["usecols"],
+            dtype=schema["dtype"],
+            engine="c",
+        )
+    except Exception:
+        return None
 
 
-def _read_csv_with_encoding(path: Path, encoding: str, use_sniff: bool) -> Optional[pd.DataFrame]:
+def _sniff_delimiter(path: Path) -> str:
     """
-    Attempt to read a CSV with a given encoding and delimiter sniffing.
+    Detect the delimiter from the first SNIFF_SAMPLE_BYTES of a file.
+
+    The result is cached per path, so each unknown file is sniffed once per process.
+    """
+    key = str(path)
+    if key not in _SNIFFED_DIALECTS:
+        try:
+            with open(path, "rb") as file:
+                sample = file.read(SNIFF_SAMPLE_BYTES).decode("utf-8-sig", errors="replace")
+            # Drop a possibly truncated last line so it cannot confuse the sniffer.
+            sample = sample.rsplit("\n", 1)[0] if "\n" in sample else sample
+            delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+        except (OSError, csv.Error):
+            delimiter = ","
+        _SNIFFED_DIALECTS[key] = delimiter
+    return _SNIFFED_DIALECTS[key]
+
+
+def _read_csv_with_encoding(path: Path, encoding: str, sep: str) -> Optional[pd.DataFrame]:
+    """
+    Attempt to read a CSV with a given encoding and delimiter.
     Returns the DataFrame on success or None on failure.
     """
-    kwargs: Dict[str, object] = {"encoding": encoding}
+    kwargs: Dict[str, object] = {"encoding": encoding, "sep": sep, "engine": "c"}
     if encoding == "utf-8":
         kwargs["encoding_errors"] = "replace"
-    if use_sniff:
-        kwargs["sep"] = None
-        kwargs["engine"] = "python"
     try:
         return pd.read_csv(path, **kwargs)
     except TypeError as type_err:
@@ -50,215 +175,584 @@ def _read_csv_with_encoding(path: Path, encoding: str, use_sniff: bool) -> Optio
 
 
 def _load_single_csv(path: Path) -> Optional[pd.DataFrame]:
-    """Load a single CSV file with tolerant encoding and delimiter handling."""
+    """
+    Load a single CSV file.
+
+    Registered files (CSV_SCHEMAS) are read directly with their recorded
+    schema; unknown files, or registered ones that no longer match, use the
+    sniffed delimiter with tolerant encoding handling.
+    """
+    schema = CSV_SCHEMAS.get(path.name)
+    if schema is not None:
+        df = _read_known_csv(path, schema)
+        if df is not None:
+            return df
+
+    sniffed = _sniff_delimiter(path)
+    separators = [sniffed] if sniffed == "," else [sniffed, ","]
     for encoding in ("utf-8-sig", "utf-8"):
-        for use_sniff in (True, False):
-            df = _read_csv_with_encoding(path, encoding, use_sniff)
+        for sep in separators:
+            df = _read_csv_with_encoding(path, encoding, sep)
             if df is not None:
                 return df
     return None
 
 
-def get_last_dataio_status() -> str:
-    """Expose last load_data status for UI diagnostics."""
-    return LAST_STATUS
+def _mtime_stamp(path: Path) -> str:
+    """scraped_at value given to rows of a file that has no scraped_at column."""
+    return datetime.fromtimestamp(path.stat().st_mtime).strftime(SCRAPED_AT_FORMAT)
 
 
-def debug_data_inventory() -> dict:
-    """Provide a snapshot of data discovery and loading details."""
+def _has_scraped_at_column(path: Path) -> bool:
+    """Check the header line of a CSV file for a scraped_at column."""
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as file:
+        return "scraped_at" in file.readline().lower()
+
+
+def _load_file_timed(path: Path) -> Tuple[Optional[pd.DataFrame], float]:
+    """
+    Load and column-normalize one CSV; return the frame and elapsed seconds.
+
+    Files without a scraped_at column (the current per-store exports) are
+    stamped with their mtime and a source derived from the file name.
+    """
+    started = time.perf_counter()
+    df = _load_single_csv(path)
+    if df is not None:
+        df.columns = df.columns.str.lower().str.strip()
+        if "scraped_at" not in df.columns:
+            df["scraped_at"] = _mtime_stamp(path)
+            if "source" not in df.columns:
+                df["source"] = path.stem.replace("_laptops", "")
+    return df, time.perf_counter() - started
+
+
+def _ingest_files(
+    csv_files: List[Path], max_workers: Optional[int], use_processes: bool
+) -> List[Tuple[Path, Optional[pd.DataFrame], float, str]]:
+    """
+    Read CSV files concurrently and return (path, frame, seconds, executor) in input order.
+
+    Parsing runs on a thread pool; with use_processes, files of at least
+    PROCESS_POOL_MIN_BYTES (history dumps) are parsed in a process pool instead.
+    """
+    workers = max_workers or min(len(csv_files), os.cpu_count() or 1)
+    large_files = set()
+    if use_processes:
+        large_files = {path for path in csv_files if path.stat().st_size >= PROCESS_POOL_MIN_BYTES}
+
+    thread_pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    process_pool: Optional[Executor] = None
+    if large_files:
+        process_pool = ProcessPoolExecutor(max_workers=max(1, min(workers, len(large_files))))
+
+    try:
+        futures = []
+        for path in csv_files:
+            if path in large_files:
+                futures.append((path, process_pool.submit(_load_file_timed, path), "process"))
+            else:
+                futures.append((path, thread_pool.submit(_load_file_timed, path), "thread"))
+
+        results = []
+        for path, future, executor_kind in futures:
+            try:
+                df, seconds = future.result()
+            except Exception:
+                df, seconds = None, 0.0
+            results.append((path, df, seconds, executor_kind))
+        return results
+    finally:
+        thread_pool.shutdown(wait=True)
+        if process_pool is not None:
+            process_pool.shutdown(wait=True)
+
+
+def _hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the sha256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_fingerprint(path: Path) -> Dict[str, object]:
+    """
+    Describe a source file by path, size, mtime and content hash.
+
+    Files without a scraped_at column also record the mtime-derived stamp
+    their rows get, which is part of their data even though it is not in
+    the content hash.
+    """
+    stat = path.stat()
     return {
-        "project_root": str(PROJECT_ROOT),
-        "data_dir": str(DATA_DIR),
-        "found_files": [str(path) for path in _LAST_FOUND_FILES],
-        "loaded_files": {name: int(count) for name, count in _LAST_LOADED_FILES.items()},
-        "status": LAST_STATUS,
+        "path": str(path.relative_to(DATA_DIR)) if path.is_relative_to(DATA_DIR) else str(path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "sha256": _hash_file(path),
+        "scraped_at_stamp": None if _has_scraped_at_column(path) else _mtime_stamp(path),
     }
 
 
-def clean_price(price_str):
-    """Normalize price text to an integer value; return None when invalid."""
-    if pd.isna(price_str):
+def _read_cache_manifest() -> Optional[Dict[str, object]]:
+    """Read the cache manifest; return None when missing or unreadable."""
+    try:
+        with open(CACHE_MANIFEST_FILE, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != CACHE_VERSION:
         return None
+    return manifest
 
-    if isinstance(price_str, (int, float)):
-        price = int(price_str)
+
+def _cache_is_fresh(manifest: Dict[str, object], csv_files: List[Path]) -> bool:
+    """
+    Check the manifest against the current source files.
+
+    Size and mtime are compared first; when only the mtime differs the
+    content hash decides, so a touched but unchanged file keeps the cache valid.
+    The new mtimes are then written back to the manifest, so the file is
+    hashed once per touch rather than on every call. Files stamped with their
+    mtime (no scraped_at column) are stale whenever that stamp changes.
+    """
+    entries = manifest.get("files") or []
+    if len(entries) != len(csv_files):
+        return False
+
+    touched = False
+    for entry, path in zip(entries, csv_files):
+        stat = path.stat()
+        expected_path = str(path.relative_to(DATA_DIR)) if path.is_relative_to(DATA_DIR) else str(path)
+        if entry.get("path") != expected_path or entry.get("size") != stat.st_size:
+            return False
+        if entry.get("mtime") != stat.st_mtime:
+            stamp = entry.get("scraped_at_stamp")
+            if stamp is not None and stamp != _mtime_stamp(path):
+                return False
+            if entry.get("sha256") != _hash_file(path):
+                return False
+            entry["mtime"] = stat.st_mtime
+            touched = True
+
+    if touched:
+        _write_manifest(manifest)
+    return True
+
+
+def _write_manifest(manifest: Dict[str, object]) -> None:
+    """Write the cache manifest via a temporary file."""
+    CACHE_MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_MANIFEST_FILE.with_name(f".{CACHE_MANIFEST_FILE.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_path, CACHE_MANIFEST_FILE)
+
+
+# Parquet stores one type per column, so object columns that mix value types
+# (numeric prices next to "13.999 TL") are written as one column per type.
+_MIXED_VALUE_TYPES = {
+    str: ("str", "string"),
+    bool: ("bool", "boolean"),
+    np.bool_: ("bool", "boolean"),
+    int: ("int", "Int64"),
+    np.int64: ("int", "Int64"),
+    float: ("float", "Float64"),
+    np.float64: ("float", "Float64"),
+}
+MIXED_COLUMN_SEPARATOR = "::"
+
+
+def _split_mixed_columns(df: pd.DataFrame) -> Tuple[Optional[pd.DataFrame], Dict[str, List[str]]]:
+    """
+    Split object columns with mixed value types into one typed column per type.
+
+    Returns the storable frame and {column: [type names]} for
+    _join_mixed_columns. The frame is None when a column holds a type that
+    cannot be stored exactly; callers then skip persisting instead of
+    converting values (str(8495.0) would re-parse as 84950).
+    """
+    parts: Dict[str, pd.Series] = {}
+    layout: Dict[str, List[str]] = {}
+    for column in df.columns:
+        series = df[column]
+        present = series.notna().to_numpy()
+        kinds = series[present].map(type).unique() if series.dtype == object else []
+        if len(kinds) <= 1:
+            parts[column] = series
+            continue
+        if any(kind not in _MIXED_VALUE_TYPES for kind in kinds):
+            return None, {}
+        kind_names = series.map(lambda value: _MIXED_VALUE_TYPES.get(type(value), ("",))[0])
+        layout[column] = []
+        for name, dtype in dict(_MIXED_VALUE_TYPES.values()).items():
+            selected = present & (kind_names == name).to_numpy()
+            if selected.any():
+                part = pd.Series(pd.NA, index=df.index, dtype=dtype)
+                part[selected] = series[selected].to_numpy()
+                parts[f"{column}{MIXED_COLUMN_SEPARATOR}{name}"] = part
+                layout[column].append(name)
+    return pd.DataFrame(parts, index=df.index), layout
+
+
+def _join_mixed_columns(df: pd.DataFrame, layout: Dict[str, List[str]]) -> pd.DataFrame:
+    """Rebuild the object columns _split_mixed_columns split; missing values become NaN."""
+    if not layout:
+        return df
+    columns: Dict[str, pd.Series] = {}
+    for column in df.columns:
+        name, separator, kind = column.rpartition(MIXED_COLUMN_SEPARATOR)
+        if not separator or kind not in layout.get(name, ()):
+            columns[column] = df[column]
+            continue
+        joined = columns.setdefault(name, pd.Series(np.nan, index=df.index, dtype=object))
+        present = df[column].notna().to_numpy()
+        joined[present] = df[column][present].to_numpy(dtype=object)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _mixed_columns_to_str(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the non-null values of mixed-type object columns with str()."""
+    converted = df
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        values = df[column].dropna()
+        if values.map(type).nunique() > 1:
+            if converted is df:
+                converted = df.copy()
+            converted[column] = df[column].map(lambda v: v if pd.isna(v) else str(v))
+    return converted
+
+
+def _write_cache(df: pd.DataFrame, csv_files: List[Path]) -> Dict[str, object]:
+    """
+    Persist the merged frame as Parquet and write its manifest; return the manifest.
+
+    Mixed-type columns are stored split by value type and listed in the
+    manifest. A frame that cannot be stored exactly is not cached (an empty
+    manifest is returned), so every load re-reads the CSV files.
+    """
+    stored, mixed_columns = _split_mixed_columns(df)
+    if stored is None:
+        CACHE_MANIFEST_FILE.unlink(missing_ok=True)
+        return {}
+    manifest = {
+        "version": CACHE_VERSION,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "rows": int(len(df)),
+        "files": [_file_fingerprint(path) for path in csv_files],
+        "mixed_columns": mixed_columns,
+    }
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    stored.to_parquet(CACHE_FILE, index=False)
+    _write_manifest(manifest)
+    return manifest
+
+
+def _discover_csv_files() -> List[Path]:
+    """List the CSV files load_data would read, in load order."""
+    if not DATA_DIR.exists():
+        return []
+    csv_files = sorted(DATA_DIR.glob("*.csv"))
+    if not csv_files:
+        csv_files = sorted(DATA_DIR.glob("*laptops*.csv"))
+    return csv_files
+
+
+def source_data_hash() -> str:
+    """
+    Return a single hash identifying the current set of source CSV files.
+
+    Reuses the cache manifest hashes when the manifest is still fresh, so
+    this is cheap right after load_data has run. The mtime-derived scraped_at
+    stamp of files without that column is included, so re-touching such a
+    file changes the hash even when its content does not.
+    """
+    csv_files = _discover_csv_files()
+    manifest = _read_cache_manifest()
+    if manifest is not None and _cache_is_fresh(manifest, csv_files):
+        entries = manifest["files"]
     else:
-        cleaned = re.sub(r"[^\d]", "", str(price_str))
-        if not cleaned:
-            return None
-        try:
-            price = int(cleaned)
-        except ValueError:
-            return None
+        entries = [_file_fingerprint(path) for path in csv_files]
 
-    if price < 1000 or price > 500_000:
-        return None
-    return price
+    digest = hashlib.sha256()
+    for entry in entries:
+        line = f"{entry['path']}:{entry['sha256']}"
+        if entry.get("scraped_at_stamp") is not None:
+            line = f"{line}:{entry['scraped_at_stamp']}"
+        digest.update(f"{line}\n".encode("utf-8"))
+    return digest.hexdigest()
 
 
-def clean_ram_value(ram_str):
-    """Extract RAM size in GB; default to 8 when it cannot be parsed."""
-    if pd.isna(ram_str):
-        return 8
+def get_last_dataio_status() -> str:
+    """Expose last load_data status for UI diagnostics."""
+    return LAST_STATUS
 
-    ram_text = str(ram_str).upper()
-    match = re.search(r"\((\d+)\s*GB\)", ram_text)
-    if match:
-        return int(match.group(1))
 
-    numbers = re.findall(r"(\d+)\s*GB", ram_text)
-    if numbers:
-        return max(int(n) for n in numbers)
+def debug_data_inventory() -> dict:
+    """Provide a snapshot of data discovery and loading details."""
+    return {
+        "project_root": str(PROJECT_ROOT),
+        "data_dir": str(DATA_DIR),
+        "found_files": [str(path) for path in _LAST_FOUND_FILES],
+        "loaded_files": {name: int(info["rows"]) for name, info in _LAST_LOADED_FILES.items()},
+        "load_timings": {
+            name: {key: value for key, value in info.items() if key != "rows"}
+            for name, info in _LAST_LOADED_FILES.items()
+        },
+        "cache_file": str(CACHE_FILE),
+        "cache_manifest": _LAST_CACHE_MANIFEST,
+        "memory_usage": _LAST_MEMORY_USAGE,
+        "distinct_caches": distinct_cache_stats(),
+        "incremental_clean": _LAST_INCREMENTAL_CLEAN,
+        "status": LAST_STATUS,
+    }
+
 
-    numbers = re.findall(r"\d+", ram_text)
-    if numbers:
-        value = int(numbers[0])
-        if value in [4, 8, 12, 16, 24, 32, 48, 64, 128]:
-            return value
+# Brand keyword table in priority order: the first brand (then keyword) listed
+# wins when a title mentions several. Extend it here or pass a custom table to
+# compile_brand_matcher; the matcher is derived from the data.
+BRAND_KEYWORDS: Dict[str, List[str]] = {
+    "apple": ["apple", "macbook", "mac "],
+    "lenovo": ["lenovo", "thinkpad", "ideapad", "yoga", "legion"],
+    "asus": ["asus", "rog", "zenbook", "vivobook", "tuf"],
+    "dell": ["dell", "alienware", "xps", "inspiron", "latitude"],
+    "hp": ["hp ", "hewlett", "omen", "pavilion", "elitebook", "victus", "omnibook"],
+    "msi": ["msi ", "msi-", "msi_"],
+    "acer": ["acer", "predator", "aspire", "nitro"],
+    "microsoft": ["microsoft", "surface"],
+    "huawei": ["huawei", "matebook"],
+    "samsung": ["samsung", "galaxy book"],
+    "monster": ["monster", "tulpar", "abra"],
+    "casper": ["casper", "excalibur", "nirvana"],
+}
+
+
+def compile_brand_matcher(brand_keywords: Dict[str, List[str]]):
+    """
+    Build a single-pass matcher for a brand keyword table.
 
-    return 8
+    Returns a function mapping lowered text to a brand (or "other"). One
+    alternation regex wrapped in a lookahead reports the keyword starting at
+    every position, so overlapping keywords are all seen and the one with the
+    best table priority wins, exactly like scanning the table in order.
+    Results are cached per text since listings repeat titles across scrapes.
+    """
+    brands = list(brand_keywords)
+    priority: Dict[str, int] = {}
+    for rank, brand in enumerate(brands):
+        for keyword in brand_keywords[brand]:
+            priority.setdefault(keyword, rank)
 
+    if not priority:
+        return lambda text: "other"
 
-def clean_ssd_value(storage_str):
-    """Extract SSD size in GB; default to 256 when it cannot be parsed."""
-    if pd.isna(storage_str):
-        return 256
+    keywords = sorted(priority, key=lambda kw: (priority[kw], -len(kw)))
+    pattern = re.compile("(?=(" + "|".join(re.escape(kw) for kw in keywords) + "))")
 
-    storage_text = str(storage_str).upper()
-    tb_match = re.search(r"(\d+)\s*TB", storage_text)
-    if tb_match:
-        return int(tb_match.group(1)) * 1024
+    @lru_cache(maxsize=4096)
+    def match(text: str) -> str:
+        best = len(brands)
+        for found in pattern.finditer(text):
+            rank = priority[found.group(1)]
+            if rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return brands[best] if best < len(brands) else "other"
 
-    gb_match = re.search(r"(\d+)\s*GB", storage_text)
-    if gb_match:
-        gb_val = int(gb_match.group(1))
-        if gb_val in [128, 256, 512, 1024, 2048]:
-            return gb_val
-        if gb_val == 1000:
-            return 1024
-        if gb_val == 500:
-            return 512
+    return match
 
-    numbers = re.findall(r"\d+", storage_text)
-    if numbers:
-        value = int(numbers[0])
-        if value in [128, 256, 512, 1024, 2048]:
-            return value
-        if value == 1:
-            return 1024
 
-    return 256
+_match_brand = compile_brand_matcher(BRAND_KEYWORDS)
 
 
 def extract_brand(name):
     """Infer brand name from the product title."""
     if pd.isna(name):
         return "other"
+    return _match_brand(str(name).lower())
 
-    name_lower = str(name).lower()
-    brand_keywords = {
-        "apple": ["apple", "macbook", "mac "],
-        "lenovo": ["lenovo", "thinkpad", "ideapad", "yoga", "legion"],
-        "asus": ["asus", "rog", "zenbook", "vivobook", "tuf"],
-        "dell": ["dell", "alienware", "xps", "inspiron", "latitude"],
-        "hp": ["hp ", "hewlett", "omen", "pavilion", "elitebook", "victus", "omnibook"],
-        "msi": ["msi ", "msi-", "msi_"],
-        "acer": ["acer", "predator", "aspire", "nitro"],
-        "microsoft": ["microsoft", "surface"],
-        "huawei": ["huawei", "matebook"],
-        "samsung": ["samsung", "galaxy book"],
-        "monster": ["monster", "tulpar", "abra"],
-        "casper": ["casper", "excalibur", "nirvana"],
-    }
 
-    for brand, keywords in brand_keywords.items():
-        for keyword in keywords:
-            if keyword in name_lower:
-                return brand
-    return "other"
+def extract_brand_series(names: pd.Series, brand_keywords: Optional[Dict[str, List[str]]] = None) -> pd.Series:
+    """
+    Column-wise extract_brand: each distinct title is matched once.
+
+    A custom brand_keywords table may be passed; BRAND_KEYWORDS is used otherwise.
+    """
+    match = _match_brand if brand_keywords is None else compile_brand_matcher(brand_keywords)
+    codes, uniques = pd.factorize(names.astype(object))
+    brands_of_uniques = np.array(
+        [match(str(value).lower()) for value in uniques] + ["other"], dtype=object
+    )
+    # factorize marks missing titles with -1, which indexes the trailing "other".
+    return pd.Series(brands_of_uniques[codes], index=names.index)
 
 
-def parse_screen_size(val) -> float:
+def _select_latest(df: pd.DataFrame, by_url: bool = False) -> pd.DataFrame:
     """
-    Parse screen size text into inches.
+    Keep only the newest snapshot rows, preserving the input order.
 
-    Values outside the 10-19.9 interval are rejected and np.nan is returned.
+    By default a row survives when its scraped_at equals the newest scraped_at
+    of its source. With by_url, the newest row per URL is kept instead; rows
+    without a URL fall back to the per-source rule.
+    """
+    if "scraped_at" not in df.columns or "source" not in df.columns:
+        return df
+
+    scraped_at = df["scraped_at"].astype(str)
+    source = df["source"].fillna("unknown").astype(str)
+    latest_of_source = scraped_at.groupby(source).transform("max")
+    keep = scraped_at == latest_of_source
+
+    if by_url and "url" in df.columns:
+        has_url = df["url"].notna()
+        newest_first = scraped_at[has_url].sort_values(ascending=False, kind="stable")
+        newest_rows = newest_first.index[~df.loc[newest_first.index, "url"].duplicated()]
+        keep = keep & ~has_url
+        keep.loc[newest_rows] = True
+
+    return df[keep].reset_index(drop=True)
+
+
+def load_data(
+    use_cache: bool = True,
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+    mode: str = "all",
+) -> pd.DataFrame:
     """
-    if pd.isna(val):
-        return np.nan
+    Load the laptop dataset in one of LOAD_MODES.
 
-    text = str(val).lower()
-    text = text.replace(",", ".")
-    text = re.sub(r"(\d{2})\s*\.\s*(\d)", r"\1.\2", text)
+    - "all": every row of every discovered CSV, historical snapshots included.
+    - "latest": only the newest scraped_at per source.
+    - "latest_url": only the newest row per product URL.
 
-    for match in re.finditer(r"(\d{2}(?:\.\d)?)", text):
-        try:
-            size = float(match.group(1))
-            if 10.0 <= size <= 19.9:
-                return size
-        except ValueError:
-            continue
+    Full history by date range is available through load_history.
+    """
+    global LAST_STATUS
+
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode {mode!r}; expected one of {LOAD_MODES}")
+
+    combined = _load_all_sources(use_cache, max_workers, use_processes)
+    if mode == "all" or combined.empty:
+        return combined
 
-    return np.nan
+    latest = _select_latest(combined, by_url=(mode == "latest_url"))
+    LAST_STATUS = f"{LAST_STATUS}; kept {len(latest)} rows ({mode})"
+    return latest
 
 
-def load_data(use_cache: bool = True) -> pd.DataFrame:
+def load_history(
+    start: Optional[str] = None, end: Optional[str] = None, sources: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Return historical snapshot rows for an inclusive date range.
+
+    Combines the partitioned history store with the legacy ALL_DATA_FILE; legacy
+    snapshots that were already imported into the store are not repeated.
+    """
+    stored = read_history(start, end, sources)
+
+    legacy = _load_single_csv(ALL_DATA_FILE) if ALL_DATA_FILE.exists() else None
+    if legacy is None or legacy.empty:
+        return stored
+
+    legacy.columns = legacy.columns.str.lower().str.strip()
+    day = legacy["scraped_at"].astype(str).str[:10]
+    mask = pd.Series(True, index=legacy.index)
+    if start is not None:
+        mask &= day >= str(start)[:10]
+    if end is not None:
+        mask &= day <= str(end)[:10]
+    if sources:
+        mask &= legacy["source"].isin([s.lower() for s in sources])
+    legacy = legacy[mask]
+
+    if not stored.empty:
+        stored_keys = set(zip(stored["source"], stored["scraped_at"]))
+        legacy_keys = pd.Series(list(zip(legacy["source"], legacy["scraped_at"])), index=legacy.index)
+        legacy = legacy[~legacy_keys.isin(stored_keys)]
+
+    history = pd.concat([legacy, stored], ignore_index=True)
+    return history.sort_values("scraped_at", kind="stable").reset_index(drop=True)
+
+
+def _load_all_sources(
+    use_cache: bool = True, max_workers: Optional[int] = None, use_processes: bool = False
+) -> pd.DataFrame:
     """
     Discover, read, and merge CSV files in the data directory.
 
-    - Uses CACHE_FILE when available (and not empty) if use_cache is True.
-    - Tries encodings utf-8-sig then utf-8 (with replacement on errors).
-    - Auto-detects delimiters via sep=None with the python engine, then falls back to defaults.
+    - Uses CACHE_FILE (Parquet) when use_cache is True and its manifest still
+      matches the discovered CSV files; stale caches are rebuilt automatically.
+    - Reads files registered in CSV_SCHEMAS in one C-engine pass with their known schema.
+    - Other files: sniffs the delimiter from the first few KB (cached per path), then
+      tries encodings utf-8-sig then utf-8 (with replacement on errors).
+    - Reads files concurrently on a thread pool (max_workers threads); with
+      use_processes, large history files are parsed in a process pool.
+    - Records rows, seconds and executor per file in _LAST_LOADED_FILES.
     - Keeps only non-empty frames, normalizes column casing, and maps a couple of key columns.
     """
-    global LAST_STATUS, _LAST_FOUND_FILES, _LAST_LOADED_FILES
+    global LAST_STATUS, _LAST_FOUND_FILES, _LAST_LOADED_FILES, _LAST_CACHE_MANIFEST
 
     _LAST_FOUND_FILES = []
     _LAST_LOADED_FILES = {}
-
-    if use_cache and CACHE_FILE.exists():
-        try:
-            with open(CACHE_FILE, "rb") as file:
-                cached_df = pickle.load(file)
-            if isinstance(cached_df, pd.DataFrame) and not cached_df.empty:
-                LAST_STATUS = f"Loaded {len(cached_df)} rows from cache"
-                _LAST_LOADED_FILES = {str(CACHE_FILE): len(cached_df)}
-                return cached_df.copy()
-            LAST_STATUS = "Cache was empty or invalid, reloading from CSV files"
-        except Exception as exc:
-            LAST_STATUS = f"Cache load failed ({exc}); reloading from CSV files"
+    _LAST_CACHE_MANIFEST = {}
 
     if not DATA_DIR.exists():
         LAST_STATUS = f"Data directory not found at {DATA_DIR}"
         return pd.DataFrame()
 
-    csv_files = sorted(DATA_DIR.glob("*.csv"))
-    if not csv_files:
-        csv_files = sorted(DATA_DIR.glob("*laptops*.csv"))
+    csv_files = _discover_csv_files()
     _LAST_FOUND_FILES = csv_files
 
     if not csv_files:
         LAST_STATUS = f"No CSV files found in {DATA_DIR}"
         return pd.DataFrame()
 
+    cache_note = ""
+    if use_cache and CACHE_FILE.exists():
+        manifest = _read_cache_manifest()
+        if manifest is not None and _cache_is_fresh(manifest, csv_files):
+            try:
+                cached_df = _join_mixed_columns(pd.read_parquet(CACHE_FILE), manifest.get("mixed_columns") or {})
+                if not cached_df.empty:
+                    LAST_STATUS = f"Loaded {len(cached_df)} rows from cache"
+                    _LAST_LOADED_FILES = {
+                        str(CACHE_FILE): {"rows": len(cached_df), "seconds": 0.0, "executor": "cache"}
+                    }
+                    _LAST_CACHE_MANIFEST = manifest
+                    return cached_df
+                cache_note = "; cache was empty, rebuilt"
+            except Exception as exc:
+                cache_note = f"; cache load failed ({exc}), rebuilt"
+        else:
+            cache_note = "; cache was stale, rebuilt"
+
     frames: List[pd.DataFrame] = []
-    loaded_counts: Dict[str, int] = {}
+    loaded_files: Dict[str, Dict[str, object]] = {}
 
-    for csv_file in csv_files:
-        df = _load_single_csv(csv_file)
+    for csv_file, df, seconds, executor_kind in _ingest_files(csv_files, max_workers, use_processes):
         if df is not None and not df.empty:
-            df.columns = df.columns.str.lower().str.strip()
             frames.append(df)
-            loaded_counts[str(csv_file)] = len(df)
+            loaded_files[str(csv_file)] = {
+                "rows": len(df),
+                "seconds": round(seconds, 4),
+                "executor": executor_kind,
+            }
 
-    _LAST_LOADED_FILES = loaded_counts
+    _LAST_LOADED_FILES = loaded_files
 
     if not frames:
         LAST_STATUS = f"Found {len(csv_files)} CSV files but none contained usable rows"
         return pd.DataFrame()
 
-    combined = pd.concat(frames, ignore_index=True)
-    combined.columns = combined.columns.str.lower().str.strip()
+    # Frames are already column-normalized, so one concat builds the result.
+    combined = pd.concat(frames, ignore_index=True, sort=False)
 
     if "price" not in combined.columns and "fiyat" in combined.columns:
         combined = combined.rename(columns={"fiyat": "price"})
@@ -268,95 +762,98 @@ def load_data(use_cache: bool = True) -> pd.DataFrame:
         elif "urun" in combined.columns:
             combined = combined.rename(columns={"urun": "name"})
 
-    LAST_STATUS = f"Loaded {len(combined)} rows from {len(loaded_counts)} CSV files"
+    LAST_STATUS = f"Loaded {len(combined)} rows from {len(loaded_files)} CSV files{cache_note}"
 
     if use_cache:
         try:
-            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(CACHE_FILE, "wb") as file:
-                pickle.dump(combined, file)
+            _LAST_CACHE_MANIFEST = _write_cache(combined, csv_files)
         except Exception:
-            # Caching failures should not break data loading.
+            # Caching failures (e.g. pyarrow missing) should not break data loading.
             pass
 
     return combined
 
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_data(
+    df: pd.DataFrame,
+    vectorized: bool = True,
+    explain_os: bool = False,
+    incremental: bool = False,
+) -> pd.DataFrame:
     """
     Normalize and enrich the raw laptop dataset.
 
+    With incremental=True only rows missing from the persisted cleaned-row
+    store are cleaned; see clean_data_incremental.
+
     - Normalize column names.
-    - Clean price/ram/ssd fields.
+    - Clean price/ram/ssd fields (column-wise unless vectorized is False).
     - Parse screen size and fill missing values with 15.6.
     - Add brand column and placeholder cpu_score/gpu_score columns.
-    - Infer operating system.
+    - Infer operating system (with explain_os, an os_rule column names the rule
+      that fired; vectorized path only).
     - Drop rows with missing name/price and prices below 5000.
     - Fill remaining missing hardware defaults.
     """
+    if incremental:
+        return clean_data_incremental(df, vectorized=vectorized, explain_os=explain_os)
+
     clean_df = df.copy()
     clean_df.columns = clean_df.columns.str.lower().str.strip()
 
     if "name" not in clean_df.columns:
         clean_df["name"] = np.nan
 
+    if vectorized:
+        parse_price, parse_ram, parse_ssd = clean_price_series, clean_ram_series, clean_ssd_series
+    else:
+        parse_price = lambda col: col.apply(clean_price)
+        parse_ram = lambda col: col.apply(clean_ram_value)
+        parse_ssd = lambda col: col.apply(clean_ssd_value)
+
     if "price" in clean_df.columns:
-        clean_df["price"] = clean_df["price"].apply(clean_price)
+        clean_df["price"] = parse_price(clean_df["price"])
     elif "fiyat" in clean_df.columns:
-        clean_df["price"] = clean_df["fiyat"].apply(clean_price)
+        clean_df["price"] = parse_price(clean_df["fiyat"])
 
     if "ram" in clean_df.columns:
-        clean_df["ram_gb"] = clean_df["ram"].apply(clean_ram_value)
+        clean_df["ram_gb"] = parse_ram(clean_df["ram"])
     else:
         clean_df["ram_gb"] = 8
 
     if "ssd" in clean_df.columns:
-        clean_df["ssd_gb"] = clean_df["ssd"].apply(clean_ssd_value)
+        clean_df["ssd_gb"] = parse_ssd(clean_df["ssd"])
     elif "storage" in clean_df.columns:
-        clean_df["ssd_gb"] = clean_df["storage"].apply(clean_ssd_value)
+        clean_df["ssd_gb"] = parse_ssd(clean_df["storage"])
     else:
         clean_df["ssd_gb"] = 256
 
     if "screen_size" in clean_df.columns:
-        clean_df["screen_size"] = clean_df["screen_size"].apply(parse_screen_size)
+        if vectorized:
+            clean_df["screen_size"] = parse_screen_size_series(clean_df["screen_size"])
+        else:
+            clean_df["screen_size"] = clean_df["screen_size"].apply(parse_screen_size)
     else:
         clean_df["screen_size"] = np.nan
     clean_df["screen_size"] = clean_df["screen_size"].fillna(15.6)
 
-    clean_df["brand"] = clean_df["name"].apply(extract_brand)
+    if vectorized:
+        clean_df["brand"] = extract_brand_series(clean_df["name"])
+    else:
+        clean_df["brand"] = clean_df["name"].apply(extract_brand)
 
     if "cpu_score" not in clean_df.columns:
         clean_df["cpu_score"] = 5.0
     if "gpu_score" not in clean_df.columns:
         clean_df["gpu_score"] = 3.0
 
-    def detect_os(row: pd.Series) -> str:
-        """Infer OS from explicit column, product name, or brand."""
-        os_field = row.get("os", None)
-        if pd.notna(os_field):
-            os_text = str(os_field).lower()
-            if any(x in os_text for x in ["windows", "win11", "win10", "w11", "w10"]):
-                return "windows"
-            if any(x in os_text for x in ["mac", "macos", "os x"]):
-                return "macos"
-            if any(x in os_text for x in ["ubuntu", "linux", "debian"]):
-                return "linux"
-            if any(x in os_text for x in ["dos", "free", "yok", "none"]):
-                return "freedos"
-
-        name_text = str(row.get("name", "")).lower()
-        if any(x in name_text for x in ["windows 11", "win11", "w11", "windows 10", "win10"]):
-            return "windows"
-        if "macbook" in name_text or "mac " in name_text:
-            return "macos"
-        if any(x in name_text for x in ["freedos", "free dos", "fdos", "dos", "/dos"]):
-            return "freedos"
-
-        if row.get("brand") == "apple":
-            return "macos"
-        return "freedos"
-
-    clean_df["os"] = clean_df.apply(detect_os, axis=1)
+    if vectorized:
+        os_values, os_rules = detect_os_series(clean_df, explain=True)
+        clean_df["os"] = os_values
+        if explain_os:
+            clean_df["os_rule"] = os_rules
+    else:
+        clean_df["os"] = clean_df.apply(detect_os, axis=1)
 
     clean_df = clean_df.dropna(subset=["price", "name"])
     clean_df = clean_df[clean_df["price"] > 5000]
@@ -370,36 +867,267 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     return clean_df.reset_index(drop=True)
 
 
-def append_to_all_data(timestamp: Optional[datetime] = None) -> int:
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Stable 64-bit hash of every row, taken over the columns in name order."""
+    ordered = df[sorted(df.columns)]
+    return pd.util.hash_pandas_object(ordered, index=False).to_numpy()
+
+
+def _clean_store_signature(columns: Iterable[str], explain_os: bool) -> str:
     """
-    Append current CSV rows into ALL_DATA_FILE with metadata columns.
+    Fingerprint of everything besides the raw row that shapes a cleaned row.
 
-    Returns the number of appended rows.
+    Covers the raw column set and the brand/OS tables; a change invalidates
+    the store instead of serving rows cleaned under the old rules.
     """
-    scraped_at = (timestamp or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
-    new_frames = []
+    payload = json.dumps(
+        {
+            "version": CLEAN_STORE_VERSION,
+            "columns": sorted(columns),
+            "explain_os": explain_os,
+            "brands": BRAND_KEYWORDS,
+            "os_rules": [OS_FIELD_RULES, OS_NAME_RULES],
+        }
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_clean_store(signature: str) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Return (cleaned rows, hashes of dropped rows); empty when missing or stale."""
+    empty = (pd.DataFrame(), np.empty(0, dtype=np.uint64))
+    try:
+        with open(CLEAN_STORE_DIR / "manifest.json", "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest.get("signature") != signature:
+            return empty
+        rows = _join_mixed_columns(
+            pd.read_parquet(CLEAN_STORE_DIR / "rows.parquet"), manifest.get("mixed_columns") or {}
+        )
+        dropped = pd.read_parquet(CLEAN_STORE_DIR / "dropped.parquet")[ROW_HASH_COLUMN]
+    except Exception:
+        return empty
+    return rows, dropped.to_numpy(dtype=np.uint64)
 
-    for path in DATA_FILES:
-        if path.exists():
-            df = pd.read_csv(path, encoding="utf-8")
-            df["scraped_at"] = scraped_at
-            df["source"] = path.stem.replace("_laptops", "")
-            new_frames.append(df)
 
-    if not new_frames:
-        return 0
+def _write_clean_store(signature: str, rows: pd.DataFrame, dropped: np.ndarray) -> None:
+    """
+    Persist the store atomically: data files first, manifest last.
+
+    Raises ValueError when rows hold values Parquet cannot store exactly.
+    """
+    stored, mixed_columns = _split_mixed_columns(rows)
+    if stored is None:
+        raise ValueError("cleaned rows hold values that cannot be stored exactly")
+    CLEAN_STORE_DIR.mkdir(parents=True, exist_ok=True)
+    for name, frame in (
+        ("rows.parquet", stored),
+        ("dropped.parquet", pd.DataFrame({ROW_HASH_COLUMN: dropped})),
+    ):
+        tmp_path = CLEAN_STORE_DIR / f".{name}.tmp"
+        frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, CLEAN_STORE_DIR / name)
+
+    manifest = {
+        "signature": signature,
+        "rows": int(len(rows)),
+        "dropped": int(len(dropped)),
+        "mixed_columns": mixed_columns,
+        "written_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    tmp_manifest = CLEAN_STORE_DIR / ".manifest.json.tmp"
+    with open(tmp_manifest, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(tmp_manifest, CLEAN_STORE_DIR / "manifest.json")
+
 
-    new_data = pd.concat(new_frames, ignore_index=True)
-    appended = len(new_data)
+def clean_data_incremental(df: pd.DataFrame, vectorized: bool = True, explain_os: bool = False) -> pd.DataFrame:
+    """
+    clean_data that only cleans rows it has not seen before.
 
-    if ALL_DATA_FILE.exists():
-        existing = pd.read_csv(ALL_DATA_FILE, encoding="utf-8")
-        combined = pd.concat([existing, new_data], ignore_index=True)
+    Each raw row is hashed and looked up in the cleaned-row store under
+    CLEAN_STORE_DIR; rows clean_data dropped are remembered too. Unseen rows
+    are cleaned in one clean_data call and added to the store. The result
+    lists the surviving rows in input order, like clean_data, although dtypes
+    may widen where stored and new rows differ (e.g. int64 and float64 price).
+    """
+    global _LAST_INCREMENTAL_CLEAN
+
+    raw_df = df.copy()
+    raw_df.columns = raw_df.columns.str.lower().str.strip()
+    hashes = row_hashes(raw_df)
+    signature = _clean_store_signature(raw_df.columns, explain_os)
+    store, dropped = _read_clean_store(signature)
+
+    stored = store[ROW_HASH_COLUMN].to_numpy(dtype=np.uint64) if not store.empty else np.empty(0, dtype=np.uint64)
+    unseen = ~(np.isin(hashes, stored) | np.isin(hashes, dropped))
+    new_raw = raw_df[unseen].assign(**{ROW_HASH_COLUMN: hashes[unseen]})
+    new_raw = new_raw.drop_duplicates(subset=ROW_HASH_COLUMN)
+
+    if not new_raw.empty:
+        cleaned_new = clean_data(new_raw, vectorized=vectorized, explain_os=explain_os)
+        new_dropped = np.setdiff1d(
+            new_raw[ROW_HASH_COLUMN].to_numpy(dtype=np.uint64),
+            cleaned_new[ROW_HASH_COLUMN].to_numpy(dtype=np.uint64),
+        )
+        store = cleaned_new if store.empty else pd.concat([store, cleaned_new], ignore_index=True)
+        dropped = np.concatenate([dropped, new_dropped])
+        try:
+            _write_clean_store(signature, store, dropped)
+        except Exception:
+            # Losing the store only costs a full clean next time.
+            pass
+
+    _LAST_INCREMENTAL_CLEAN = {
+        "rows": int(len(raw_df)),
+        "cleaned": int(len(new_raw)),
+        "reused": int(len(raw_df) - unseen.sum()),
+    }
+
+    if store.empty:
+        return clean_data(raw_df.iloc[0:0], vectorized=vectorized, explain_os=explain_os)
+
+    positions = pd.Index(store[ROW_HASH_COLUMN].to_numpy(dtype=np.uint64)).get_indexer(hashes)
+    result = store.take(positions[positions >= 0]).drop(columns=ROW_HASH_COLUMN)
+    return result.reset_index(drop=True)
+
+
+def iter_csv_chunks(path: Path = ALL_DATA_FILE, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream a raw CSV in chunks of at most chunksize rows.
+
+    Registered files use their CSV_SCHEMAS entry; other files use the sniffed
+    delimiter. Column names are normalized like in load_data.
+    """
+    schema = CSV_SCHEMAS.get(path.name)
+    if schema is not None:
+        kwargs: Dict[str, object] = {
+            "sep": schema["sep"],
+            "encoding": schema["encoding"],
+            "usecols": schema["usecols"],
+            "dtype": schema["dtype"],
+        }
     else:
-        combined = new_data
+        kwargs = {"sep": _sniff_delimiter(path), "encoding": "utf-8-sig"}
+
+    with pd.read_csv(path, engine="c", chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.lower().str.strip()
+            yield chunk
+
+
+def clean_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Run clean_data over raw chunks and yield the non-empty cleaned chunks.
+
+    Every cleaning step is row-local, so the concatenated output equals
+    clean_data on the whole input (up to the index, which restarts per chunk).
+    Only one chunk is held in memory at a time.
+    """
+    for chunk in chunks:
+        cleaned = clean_data(chunk)
+        if not cleaned.empty:
+            yield cleaned
+
+
+def write_clean_chunks(chunks: Iterable[pd.DataFrame], output_path: Path) -> int:
+    """
+    Append cleaned chunks to one CSV file and return the number of rows written.
+
+    The file is replaced, written with the same encoding as save_data. The
+    header comes from the first chunk; later chunks are written in its column
+    order, with missing columns left empty. A chunk with a column the header
+    lacks raises ValueError.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    columns: Optional[pd.Index] = None
+    with open(output_path, "w", encoding="utf-8-sig", newline="") as file:
+        for chunk in chunks:
+            if columns is None:
+                columns = chunk.columns
+                chunk.to_csv(file, index=False)
+            else:
+                extra = chunk.columns.difference(columns)
+                if len(extra):
+                    raise ValueError(f"Chunk has columns missing from the header: {list(extra)}")
+                chunk.reindex(columns=columns).to_csv(file, index=False, header=False)
+            written += len(chunk)
+    return written
+
+
+def _record_memory_usage(report: Dict[str, object]) -> None:
+    """Remember the latest compact_dtypes report for debug_data_inventory."""
+    global _LAST_MEMORY_USAGE
+    _LAST_MEMORY_USAGE = dict(report)
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a cleaned/prepared frame to compact dtypes.
+
+    - CATEGORY_COLUMNS become categoricals.
+    - ram_gb/ssd_gb become the narrowest integer type that holds them.
+    - Other float columns become float32 only when that is lossless; scores
+      such as 6.8 or 7.2 are not exact in float32 and would shift threshold
+      comparisons (e.g. gpu_score >= 6.6), so those stay float64.
+    - scraped_at becomes datetime64.
+    - Raw columns mixing numbers and text (ram, ssd) hold str() values, so
+      they can become categoricals; the parsed *_gb columns are unaffected.
+
+    memory_usage(deep=True) before and after is reported via debug_data_inventory.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    compact = _mixed_columns_to_str(df)
+    if compact is df:
+        compact = df.copy()
+
+    for column in CATEGORY_COLUMNS:
+        if column in compact.columns:
+            compact[column] = compact[column].astype("category")
+
+    for column in ("ram_gb", "ssd_gb"):
+        if column in compact.columns and compact[column].notna().all():
+            compact[column] = pd.to_numeric(compact[column], downcast="integer")
+
+    for column in compact.select_dtypes(include="float64").columns:
+        values = compact[column].to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            compact[column] = narrowed
+
+    if "scraped_at" in compact.columns:
+        compact["scraped_at"] = pd.to_datetime(compact["scraped_at"], format=SCRAPED_AT_FORMAT, errors="coerce")
+
+    after = int(compact.memory_usage(deep=True).sum())
+    _record_memory_usage(
+        {
+            "before_bytes": before,
+            "after_bytes": after,
+            "dtypes": {column: str(dtype) for column, dtype in compact.dtypes.items()},
+        }
+    )
+    return compact
+
+
+def append_to_all_data(timestamp: Optional[datetime] = None) -> int:
+    """
+    Append current CSV rows to the partitioned history store with metadata columns.
+
+    Each source becomes one new partition file (see core.history), so the cost is
+    proportional to the new rows only; ALL_DATA_FILE is no longer rewritten.
+    Returns the number of appended rows.
+    """
+    scraped_at = (timestamp or datetime.now()).strftime(SCRAPED_AT_FORMAT)
+    appended = 0
+
+    for path in DATA_FILES:
+        if path.exists():
+            df = _load_single_csv(path)
+            if df is None or df.empty:
+                continue
+            write_snapshot(df, path.stem.replace("_laptops", ""), scraped_at)
+            appended += len(df)
 
-    ALL_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_csv(ALL_DATA_FILE, index=False, encoding="utf-8-sig")
     return appended
 
 
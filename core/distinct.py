@@ -0,0 +1,178 @@
+"""
+Parse-on-uniques layer for the text normalizers.
+
+Cells repeat heavily across scrapes ("16GB", "512GB SSD", the same CPU and
+GPU strings), so map_distinct factorizes a column, runs a normalizer once per
+distinct value and broadcasts the results back. Results are kept in a bounded
+LRU per normalizer that persists across calls, so chunked or repeated cleaning
+only parses values it has not seen before. Hit/miss counters are exposed
+through distinct_cache_stats.
+
+Cached results assume the normalizer is pure. A normalizer that reads
+mutable tables (e.g. scoring.CPU_SCORES) must be cached under a name that
+changes with those tables, as catalog.score_hardware does with the scoring
+table hash (dropping the caches of older hashes via drop_distinct_caches);
+clear_distinct_caches empties everything.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+import threading
+import numpy as np
+import pandas as pd
+
+DISTINCT_CACHE_SIZE = 8192
+
+
+class DistinctCache:
+    """
+    Bounded LRU of normalizer results keyed by the raw cell value.
+
+    Entries are keyed on (type(value), value): 1, 1.0 and True compare equal
+    but a normalizer may treat them differently (str() gives "1", "1.0", "True").
+    """
+
+    def __init__(self, name: str, maxsize: int = DISTINCT_CACHE_SIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values: "OrderedDict[Tuple[type, Hashable], object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[Hashable], compute: Callable[[List[Hashable]], Sequence]) -> List:
+        """
+        Return one result per key, computing the missing ones in a single call.
+
+        compute receives the keys that were not cached and returns their
+        results in the same order.
+        """
+        results: List = [None] * len(keys)
+        missing: List[int] = []
+        with self._lock:
+            for position, key in enumerate(keys):
+                entry = (type(key), key)
+                if entry in self._values:
+                    self._values.move_to_end(entry)
+                    results[position] = self._values[entry]
+                else:
+                    missing.append(position)
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            computed = compute([keys[position] for position in missing])
+            with self._lock:
+                for position, value in zip(missing, computed):
+                    entry = (type(keys[position]), keys[position])
+                    results[position] = value
+                    self._values[entry] = value
+                    self._values.move_to_end(entry)
+                while len(self._values) > self.maxsize:
+                    self._values.popitem(last=False)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._values), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        """Drop cached results and reset the counters."""
+        with self._lock:
+            self._values.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_CACHES: Dict[str, DistinctCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_distinct_cache(name: str, maxsize: Optional[int] = None) -> DistinctCache:
+    """Return the process-wide cache registered under name, creating it on first use."""
+    with _CACHES_LOCK:
+        cache = _CACHES.get(name)
+        if cache is None:
+            cache = DistinctCache(name, maxsize or DISTINCT_CACHE_SIZE)
+            _CACHES[name] = cache
+        return cache
+
+
+def distinct_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Counters of every registered cache, keyed by normalizer name."""
+    with _CACHES_LOCK:
+        return {name: cache.stats() for name, cache in _CACHES.items()}
+
+
+def clear_distinct_caches() -> None:
+    """Empty every registered cache."""
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    for cache in caches:
+        cache.clear()
+
+
+def drop_distinct_caches(predicate: Callable[[str], bool]) -> int:
+    """Unregister the caches whose name matches predicate; return how many were dropped."""
+    with _CACHES_LOCK:
+        names = [name for name in _CACHES if predicate(name)]
+        for name in names:
+            del _CACHES[name]
+    return len(names)
+
+
+def _cache_name(func: Callable) -> str:
+    """Default cache name of a module-level function; anything else needs an explicit name."""
+    qualname = getattr(func, "__qualname__", "<unnamed>")
+    if "<" in qualname:
+        raise ValueError(f"map_distinct needs an explicit cache name for {func!r}")
+    return f"{func.__module__}.{qualname}"
+
+
+def factorize_by_type(series: pd.Series) -> Tuple[np.ndarray, List[Hashable]]:
+    """
+    pd.factorize that keeps values of different types apart.
+
+    factorize treats 1, 1.0 and True as one value, so object columns holding
+    several value types are factorized one type at a time.
+    """
+    values = series.astype(object)
+    kinds = values.map(type).to_numpy() if series.dtype == object else None
+    if kinds is None or len(set(kinds)) <= 1:
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        return codes, list(uniques)
+
+    codes = np.full(len(values), -1, dtype=np.intp)
+    uniques: List[Hashable] = []
+    for kind in dict.fromkeys(kinds):
+        selected = kinds == kind
+        kind_codes, kind_uniques = pd.factorize(values[selected], use_na_sentinel=True)
+        codes[selected] = np.where(kind_codes >= 0, kind_codes + len(uniques), -1)
+        uniques.extend(kind_uniques)
+    return codes, uniques
+
+
+def map_distinct(series: pd.Series, func: Callable, name: Optional[str] = None) -> pd.Series:
+    """
+    series.apply(func), evaluating func once per distinct value.
+
+    Results are cached under name, which defaults to the qualified name of a
+    module-level func; lambdas, nested functions and partials must pass one,
+    since two of them would otherwise share a cache.
+
+    Missing cells are passed to func directly (once) instead of being cached,
+    since NaN keys do not compare equal. The result dtype is inferred the same
+    way apply infers it.
+    """
+    cache = get_distinct_cache(name or _cache_name(func))
+    codes, uniques = factorize_by_type(series)
+
+    results = cache.get_many(uniques, lambda keys: [func(key) for key in keys])
+    missing = codes < 0
+    if missing.any():
+        results.append(func(series[missing].iloc[0]))
+    else:
+        results.append(None)
+
+    values = np.empty(len(results), dtype=object)
+    values[:] = results
+    return pd.Series(values[codes], index=series.index, name=series.name).infer_objects()
@@ -0,0 +1,208 @@
+"""
+Cross-store entity resolution: one canonical product id per laptop model.
+
+The same laptop is listed by several stores under different titles. Rows are
+first grouped by a blocking key (brand, CPU model, GPU, RAM, SSD), so only
+rows that already agree on the hardware are compared. Inside a block, titles
+are reduced to their model words ("vivobook", "slim") and model codes
+("x1504va", "83k1004etr", "s100"). Two rows are the same product when their
+SKU codes agree, or they share a model code, or neither code set contradicts
+the other and their model words overlap enough. Identical titles collapse before the pairwise
+step, so the work stays close to linear in the row count.
+"""
+from typing import Dict, FrozenSet, List, Tuple
+import hashlib
+import re
+import numpy as np
+import pandas as pd
+
+# Minimum overlap coefficient |A & B| / min(|A|, |B|) of model words.
+NAME_SIMILARITY = 0.6
+# Listings whose screen sizes differ by more than this are different models.
+MAX_SCREEN_DIFF = 1.0
+# Codes at least this long are SKU numbers ("fx608jhr", "83a100a5tr"); when
+# both titles carry one, they decide the match on their own.
+SKU_CODE_LENGTH = 6
+
+_CPU_PATTERNS: List[Tuple["re.Pattern[str]", str]] = [
+    (re.compile(r"\bi([3579])[\s\-]*(\d{4,5})"), "i{0}-{1}"),
+    (re.compile(r"ultra\s*([579])[\s\-]*(\d{3})"), "ultra{0}-{1}"),
+    (re.compile(r"ryzen\s*(?:ai\s*)?([3579])[\s\-]*(?:pro\s*)?(\d{3,4})"), "ryzen{0}-{1}"),
+    (re.compile(r"\bcore\s*([357])[\s\-]*(\d{3})"), "core{0}-{1}"),
+    (re.compile(r"\b(m[1-5])\b"), "apple-{0}"),
+    (re.compile(r"\b(n\d{3,4})\b"), "intel-{0}"),
+]
+
+# Spec fragments removed from titles before tokenizing; the block key already
+# covers them and they would otherwise dominate the overlap.
+_SPEC_RE = re.compile(
+    r"\d+\s*(?:gb|tb|hz|ghz|mhz|w)\b"
+    r"|\d{2}[.,]\d\s*(?:\"|''|inç|inch|inc)?"
+    r"|\d+\.\s*nesil"
+    r"|\b(?:i[3579]|ultra\s*[579]|ryzen\s*[3579]|core\s*[357])[\s\-]*\d{3,5}[a-z]*"
+    r"|\b(?:rtx|gtx|rx)\s*\d{3,4}\w*"
+    r"|\b(?:lp)?g?ddr\d\w*|\bpcie\d\w*|\bw1[01]\w*|\d{3,4}x\d{3,4}"
+)
+_TOKEN_RE = re.compile(r"[a-z0-9çğıöşü]+")
+_STOP_WORDS = frozenset(
+    """
+    laptop notebook dizüstü dizustu bilgisayar bilgisayarı bilgisayari taşınabilir tasinabilir
+    gaming oyun freedos free dos windows win w11 w10 home fhd full hd wuxga ips oled ekran
+    inç inc inch ram ssd gb tb ddr4 ddr5 lpddr5 lpddr5x intel core amd ryzen nvidia geforce
+    rtx gtx radeon graphics işlemci islemci çekirdek cekirdek çekirdekli cpu gpu nesil ve ile
+    için with çip çipli cip gri gümüş siyah mavi beyaz uzay the and touch dokunmatik
+    nb hx ai evo liquid retina xdr intelligence processor birleşik bellek hediye çanta mouse
+    qhd uhd wqhd wqxga oyuncu ultra arc iris xe uma
+    """.split()
+)
+
+
+def cpu_key(name, cpu) -> str:
+    """CPU family and model number ("i5-13420", "ryzen7-7735"), read from the title first."""
+    for text in (str(name).lower(), str(cpu).lower()):
+        for pattern, template in _CPU_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return template.format(*match.groups())
+    return " ".join(_TOKEN_RE.findall(str(cpu).lower()))
+
+
+def name_tokens(name, brand: str = "") -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Split a title into (model words, model codes) after removing spec fragments."""
+    text = _SPEC_RE.sub(" ", str(name).lower())
+    words, codes = set(), set()
+    for token in _TOKEN_RE.findall(text):
+        if token in _STOP_WORDS or token == brand:
+            continue
+        has_digit = any(ch.isdigit() for ch in token)
+        if has_digit and any(ch.isalpha() for ch in token) and len(token) >= 3:
+            codes.add(token)
+        elif not has_digit and len(token) >= 2:
+            words.add(token)
+    return frozenset(words), frozenset(codes)
+
+
+def blocking_keys(df: pd.DataFrame) -> pd.Series:
+    """brand|cpu|gpu|ram|ssd key per row; only rows sharing a key are compared."""
+    def column(name: str, default: object) -> pd.Series:
+        if name in df.columns:
+            return df[name].astype(object).where(df[name].notna(), default).astype(str)
+        return pd.Series(str(default), index=df.index)
+
+    names = column("name", "")
+    cpus = [cpu_key(n, c) for n, c in zip(names, column("cpu", ""))]
+    return (
+        column("brand", "other") + "|" + pd.Series(cpus, index=df.index) + "|"
+        + column("gpu_norm", "") + "|" + column("ram_gb", "") + "|" + column("ssd_gb", "")
+    )
+
+
+def _codes_agree(codes_a: FrozenSet[str], codes_b: FrozenSet[str]) -> bool:
+    """True when one SKU code equals or extends another ("429xtr" / "429xtr008")."""
+    return any(a.startswith(b) or b.startswith(a) for a in codes_a for b in codes_b)
+
+
+def _same_product(a: Tuple[FrozenSet[str], FrozenSet[str], float], b: Tuple[FrozenSet[str], FrozenSet[str], float]) -> bool:
+    """Decide whether two titles in one block describe the same model."""
+    words_a, codes_a, screen_a = a
+    words_b, codes_b, screen_b = b
+    if abs(screen_a - screen_b) > MAX_SCREEN_DIFF:
+        return False
+    if words_a and words_b and not words_a & words_b:
+        return False
+    sku_a = {code for code in codes_a if len(code) >= SKU_CODE_LENGTH}
+    sku_b = {code for code in codes_b if len(code) >= SKU_CODE_LENGTH}
+    if sku_a and sku_b:
+        return _codes_agree(sku_a, sku_b)
+    if codes_a & codes_b:
+        return True
+    if (codes_a and codes_b) or not words_a or not words_b:
+        return False
+    return len(words_a & words_b) / min(len(words_a), len(words_b)) >= NAME_SIMILARITY
+
+
+def _find(parent: List[int], item: int) -> int:
+    """Union-find root with path halving."""
+    while parent[item] != item:
+        parent[item] = parent[parent[item]]
+        item = parent[item]
+    return item
+
+
+def resolve_products(df: pd.DataFrame) -> pd.Series:
+    """
+    Assign a canonical product_id to every row.
+
+    The id is a short hash of the block key and the smallest title of the
+    cluster, so it is stable while the cluster keeps its members.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+
+    keys = blocking_keys(df)
+    if "name" in df.columns:
+        names = df["name"].astype(object).where(df["name"].notna(), "").astype(str)
+    else:
+        names = pd.Series("", index=df.index)
+    if "screen_size" in df.columns:
+        screens = df["screen_size"].to_numpy(dtype=float)
+    else:
+        screens = np.full(len(df), 15.6)
+
+    # One entry per distinct (block, title, screen); pairwise work runs on these.
+    distinct: Dict[Tuple[str, str, float], int] = {}
+    row_entry = np.empty(len(df), dtype=np.int64)
+    for position, triple in enumerate(zip(keys, names, screens)):
+        row_entry[position] = distinct.setdefault(triple, len(distinct))
+
+    entries = list(distinct)
+    features = []
+    for block, name, screen in entries:
+        words, codes = name_tokens(name, block.split("|", 1)[0])
+        features.append((words, codes, screen))
+
+    parent = list(range(len(entries)))
+    by_block: Dict[str, List[int]] = {}
+    for entry, (block, _, _) in enumerate(entries):
+        by_block.setdefault(block, []).append(entry)
+
+    for members in by_block.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                if _find(parent, first) != _find(parent, second) and _same_product(features[first], features[second]):
+                    parent[_find(parent, second)] = _find(parent, first)
+
+    labels: Dict[int, str] = {}
+    for entry, (block, name, _) in enumerate(entries):
+        root = _find(parent, entry)
+        if root not in labels or name < labels[root]:
+            labels[root] = name
+    ids = {
+        root: hashlib.sha1(f"{entries[root][0]}|{label}".encode("utf-8")).hexdigest()[:12]
+        for root, label in labels.items()
+    }
+    entry_ids = np.array([ids[_find(parent, entry)] for entry in range(len(entries))], dtype=object)
+    return pd.Series(entry_ids[row_entry], index=df.index, name="product_id")
+
+
+def add_product_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Add product_id and store_count (distinct sources listing the product) columns."""
+    df["product_id"] = resolve_products(df)
+    if "source" in df.columns:
+        df["store_count"] = df.groupby("product_id")["source"].transform("nunique").astype("int64")
+    else:
+        df["store_count"] = 1
+    return df
+
+
+def cheapest_offers(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep the cheapest row of every product_id, in the frame's original order.
+
+    Rows without a price are only kept for products with no priced row.
+    """
+    if df.empty or "product_id" not in df.columns:
+        return df
+    order = df.assign(_position=np.arange(len(df))).sort_values(["price", "_position"], kind="stable")
+    keep = np.sort(order.drop_duplicates(subset="product_id")["_position"].to_numpy())
+    return df.iloc[keep]
@@ -0,0 +1,282 @@
+"""
+Append-only, partitioned store for historical scrape snapshots.
+
+Layout: HISTORY_DIR/source=<source>/date=<YYYY-MM-DD>/<timestamp>.parquet, one
+file per (source, scraped_at). Appending a scrape writes only the new rows;
+compact_history merges the files of each partition, and read_history selects
+partitions by source and date range without touching the others.
+"""
+from pathlib import Path
+from datetime import date, datetime
+from typing import Iterator, Optional, List, Set, Tuple, Union
+import argparse
+import json
+import os
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+HISTORY_DIR = PROJECT_ROOT / "data" / "history"
+LEGACY_ALL_DATA_FILE = PROJECT_ROOT / "data" / "all_data.csv"
+
+SCRAPED_AT_FORMAT = "%Y-%m-%d %H:%M:%S"
+COMPACTED_PREFIX = "compacted"
+# Parquet metadata key listing the snapshot files merged into a compacted file.
+COMPACTED_PARTS_KEY = b"compacted_parts"
+
+DateLike = Union[date, datetime, str]
+
+
+def _partition_dir(source: str, day: str) -> Path:
+    """Return the directory holding one source's snapshots for one day."""
+    return HISTORY_DIR / f"source={source}" / f"date={day}"
+
+
+def _to_date(value: Optional[DateLike]) -> Optional[date]:
+    """Coerce a date, datetime or ISO string into a date."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+
+def _write_atomic(df: pd.DataFrame, path: Path) -> None:
+    """Write a Parquet file via a temporary name so readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(df: pd.DataFrame, source: str, scraped_at: str) -> Path:
+    """
+    Store one source's rows for one scrape as a new partition file.
+
+    Adds the scraped_at and source columns; cost is proportional to len(df).
+    """
+    stamp = datetime.strptime(scraped_at, SCRAPED_AT_FORMAT)
+    snapshot = df.copy()
+    snapshot["scraped_at"] = scraped_at
+    snapshot["source"] = source
+
+    path = _partition_dir(source, stamp.strftime("%Y-%m-%d")) / f"{stamp:%Y%m%dT%H%M%S}.parquet"
+    suffix = 1
+    while path.exists():
+        path = path.with_name(f"{stamp:%Y%m%dT%H%M%S}-{suffix}.parquet")
+        suffix += 1
+    _write_atomic(snapshot, path)
+    return path
+
+
+def list_partitions(
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None,
+    sources: Optional[List[str]] = None,
+) -> List[Tuple[str, date, Path]]:
+    """List (source, day, directory) partitions within the inclusive date range."""
+    if not HISTORY_DIR.exists():
+        return []
+
+    start_day, end_day = _to_date(start), _to_date(end)
+    wanted = {s.lower() for s in sources} if sources else None
+    partitions: List[Tuple[str, date, Path]] = []
+
+    for source_dir in sorted(HISTORY_DIR.glob("source=*")):
+        source = source_dir.name.split("=", 1)[1]
+        if wanted is not None and source not in wanted:
+            continue
+        for day_dir in sorted(source_dir.glob("date=*")):
+            try:
+                day = date.fromisoformat(day_dir.name.split("=", 1)[1])
+            except ValueError:
+                continue
+            if start_day is not None and day < start_day:
+                continue
+            if end_day is not None and day > end_day:
+                continue
+            partitions.append((source, day, day_dir))
+
+    partitions.sort(key=lambda item: (item[1], item[0]))
+    return partitions
+
+
+def _compacted_file(day_dir: Path) -> Path:
+    """Return the path of a partition's compacted file (which may not exist)."""
+    day = day_dir.name.split("=", 1)[1].replace("-", "")
+    return day_dir / f"{COMPACTED_PREFIX}-{day}.parquet"
+
+
+def _merged_part_names(compacted: Path) -> Set[str]:
+    """Names of the snapshot files already merged into a compacted file."""
+    import pyarrow.parquet as pq
+
+    if not compacted.exists():
+        return set()
+    metadata = pq.read_schema(compacted).metadata or {}
+    return set(json.loads(metadata.get(COMPACTED_PARTS_KEY, b"[]")))
+
+
+def _live_parts(day_dir: Path) -> List[Path]:
+    """
+    List a partition's files, skipping snapshots already merged into its compacted file.
+
+    Those are only left behind when compact_history stopped before removing them.
+    """
+    merged = _merged_part_names(_compacted_file(day_dir))
+    return [part for part in sorted(day_dir.glob("*.parquet")) if part.name not in merged]
+
+
+def stored_snapshots(sources: Optional[List[str]] = None) -> Set[Tuple[str, str]]:
+    """
+    Return the (source, scraped_at) pairs already in the store.
+
+    Only the scraped_at column of each file is read.
+    """
+    import pyarrow.parquet as pq
+
+    snapshots: Set[Tuple[str, str]] = set()
+    for source, _, day_dir in list_partitions(sources=sources):
+        for part in _live_parts(day_dir):
+            stamps = pq.read_table(part, columns=["scraped_at"]).column("scraped_at").to_pylist()
+            snapshots.update((source, str(stamp)) for stamp in set(stamps))
+    return snapshots
+
+
+def read_history(
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None,
+    sources: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read historical rows for the given sources and inclusive date range.
+
+    Only the matching partition directories are opened. Rows come back in
+    scraped_at order.
+    """
+    frames: List[pd.DataFrame] = []
+    for _, _, day_dir in list_partitions(start, end, sources):
+        for part in _live_parts(day_dir):
+            frames.append(pd.read_parquet(part))
+
+    if not frames:
+        return pd.DataFrame()
+
+    history = pd.concat(frames, ignore_index=True)
+    return history.sort_values("scraped_at", kind="stable").reset_index(drop=True)
+
+
+def iter_history(
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None,
+    sources: Optional[List[str]] = None,
+    batch_size: int = 5000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream historical rows in batches of at most batch_size rows.
+
+    Partitions are visited in date order and each file is read batch by batch,
+    so memory stays bounded regardless of how much history is selected.
+    """
+    import pyarrow.parquet as pq
+
+    for _, _, day_dir in list_partitions(start, end, sources):
+        for part in _live_parts(day_dir):
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=batch_size):
+                yield batch.to_pandas()
+
+
+def compact_history(
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None,
+    sources: Optional[List[str]] = None,
+) -> int:
+    """
+    Merge the snapshot files of each partition into a single file.
+
+    The compacted file lists the files it merged in its Parquet metadata, so
+    a re-run after an interrupted cleanup deletes the leftovers instead of
+    merging their rows a second time. Returns the number of partitions that
+    were rewritten.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    compacted = 0
+    for _, _, day_dir in list_partitions(start, end, sources):
+        target = _compacted_file(day_dir)
+        merged_names = _merged_part_names(target)
+        for part in sorted(day_dir.glob("*.parquet")):
+            if part.name in merged_names:
+                part.unlink()
+
+        parts = sorted(day_dir.glob("*.parquet"))
+        if len(parts) < 2:
+            continue
+
+        merged = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+        merged = merged.sort_values("scraped_at", kind="stable").reset_index(drop=True)
+        merged_names.update(part.name for part in parts if part != target)
+        table = pa.Table.from_pandas(merged, preserve_index=False)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), COMPACTED_PARTS_KEY: json.dumps(sorted(merged_names)).encode("utf-8")}
+        )
+        tmp_target = day_dir / f".{target.name}.new"
+        pq.write_table(table, tmp_target)
+
+        # Publish the merged file first; a crash before the cleanup leaves
+        # files the metadata already accounts for, never missing rows.
+        os.replace(tmp_target, target)
+        for part in parts:
+            if part != target:
+                part.unlink()
+        compacted += 1
+    return compacted
+
+
+def import_legacy_all_data(path: Path = LEGACY_ALL_DATA_FILE) -> int:
+    """
+    Split a legacy all_data.csv into history partitions.
+
+    Returns the number of imported rows; rows without scraped_at or source are
+    skipped, and so are (source, scraped_at) snapshots already in the store, so
+    the import can be re-run safely.
+    """
+    if not path.exists():
+        return 0
+
+    legacy = pd.read_csv(path, encoding="utf-8-sig")
+    legacy = legacy.dropna(subset=["scraped_at", "source"])
+    stored = stored_snapshots()
+    imported = 0
+    for (source, scraped_at), group in legacy.groupby(["source", "scraped_at"], sort=False):
+        if (str(source), str(scraped_at)) in stored:
+            continue
+        write_snapshot(group.drop(columns=["scraped_at", "source"]), str(source), str(scraped_at))
+        imported += len(group)
+    return imported
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the partitioned scrape history store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact = subparsers.add_parser("compact", help="Merge snapshot files per partition.")
+    compact.add_argument("--start", help="First day to compact (YYYY-MM-DD).")
+    compact.add_argument("--end", help="Last day to compact (YYYY-MM-DD).")
+    compact.add_argument("--source", action="append", dest="sources", help="Limit to a source.")
+
+    subparsers.add_parser("import-legacy", help="Import data/all_data.csv into the store.")
+
+    args = parser.parse_args()
+    if args.command == "compact":
+        count = compact_history(args.start, args.end, args.sources)
+        print(f"Compacted {count} partitions")
+    elif args.command == "import-legacy":
+        count = import_legacy_all_data()
+        print(f"Imported {count} rows from {LEGACY_ALL_DATA_FILE}")
+
+
+if __name__ == "__main__":
+    main()
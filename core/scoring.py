@@ -1,11 +1,18 @@
 ﻿from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
+import hashlib
+import json
+
 import numpy as np
 import pandas as pd
 import re
 
+from core.bitmap import BitmapIndex
+from core.entities import cheapest_offers
+
 # =============================================================================
 # Sabitler
 # =============================================================================
@@ -275,38 +282,38 @@ MIN_REQUIREMENTS: Dict[str, Dict[str, Any]] = {
     "dev": {"ram_gb": 16, "cpu_score": 7.0, "ssd_gb": 512},
 }
 
+# Hazır katalogdaki cpu_score / gpu_norm / gpu_score, dev_fit_* ve partial_* kolonlarını etkileyen tablolar.
+SCORING_TABLES: Dict[str, Dict[str, Any]] = {
+    "CPU_SCORES": CPU_SCORES,
+    "GPU_SCORES": GPU_SCORES,
+    "RTX_MODEL_SCORES": RTX_MODEL_SCORES,
+    "GTX_MODEL_SCORES": GTX_MODEL_SCORES,
+    "MX_MODEL_SCORES": MX_MODEL_SCORES,
+    "RX_MODEL_SCORES": RX_MODEL_SCORES,
+    "DEV_PRESETS": DEV_PRESETS,
+    "BRAND_SCORES": BRAND_SCORES,
+    "BRAND_PARAM_SCORES": BRAND_PARAM_SCORES,
+    "BASE_WEIGHTS": BASE_WEIGHTS,
+}
+
+
+def scoring_tables_hash() -> str:
+    """
+    Skor tablolarının içeriğinden sha256 özeti üretir.
+    CPU_SCORES sırası eşleşmeyi etkilediği için anahtarlar sıralanmaz.
+    """
+    payload = json.dumps(SCORING_TABLES, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 # =============================================================================
 # CPU / GPU yardımcıları
 # =============================================================================
 
 
 def get_cpu_score(cpu_text: str | float | None) -> float:
-    """CPU metninden 0-10 aralığında bir skor üretir."""
-    if pd.isna(cpu_text):
-        return 5.0
-
-    cpu_lower = str(cpu_text).lower()
-
-    for key, score in CPU_SCORES.items():
-        if key in cpu_lower:
-            if "hx" in cpu_lower:
-                return min(10.0, score + 0.5)
-            if " u" in cpu_lower or "-u" in cpu_lower:
-                return max(1.0, score - 1.0)
-            if " p" in cpu_lower or "-p" in cpu_lower:
-                return score - 0.3
-            return score
-
-    if "i9" in cpu_lower or "ryzen 9" in cpu_lower:
-        return 9.0
-    if "i7" in cpu_lower or "ryzen 7" in cpu_lower:
-        return 7.5
-    if "i5" in cpu_lower or "ryzen 5" in cpu_lower:
-        return 6.0
-    if "i3" in cpu_lower or "ryzen 3" in cpu_lower:
-        return 4.0
-
-    return 5.0
+    """CPU metninden 0-10 aralığında bir skor üretir (bkz. resolve_cpu_model)."""
+    return resolve_cpu_model(cpu_text)[1]
 
 
 def get_gpu_score(gpu_text: str | float | None) -> float:
@@ -412,65 +419,284 @@ def get_gpu_score(gpu_text: str | float | None) -> float:
 
 
 def normalize_gpu_model(gpu_text: str | float | None) -> str:
-    """Ham GPU metnini okunabilir, tekilleştirilmiş bir etikete çevirir."""
-    if pd.isna(gpu_text) or str(gpu_text).strip() == "":
-        return "Integrated (generic)"
+    """Ham GPU metnini okunabilir, tekilleştirilmiş bir etikete çevirir (bkz. resolve_gpu_model)."""
+    return resolve_gpu_model(gpu_text)[1]
 
-    s = str(gpu_text).lower().strip()
 
-    m = re.search(r"\brtx[\s\-]?(\d{3,4})(?:\s*(ti|super|max\-q|laptop)?)?\b", s)
+# =============================================================================
+# Model çözümleyici
+# =============================================================================
+
+# CPU_SCORES anahtarı bulunamazsa sırayla denenen genel seviye eşleşmeleri.
+_CPU_FALLBACKS: Tuple[Tuple[str, str, float], ...] = (
+    ("i9", "intel-i9", 9.0),
+    ("ryzen 9", "amd-ryzen-9", 9.0),
+    ("i7", "intel-i7", 7.5),
+    ("ryzen 7", "amd-ryzen-7", 7.5),
+    ("i5", "intel-i5", 6.0),
+    ("ryzen 5", "amd-ryzen-5", 6.0),
+    ("i3", "intel-i3", 4.0),
+    ("ryzen 3", "amd-ryzen-3", 4.0),
+)
+CPU_MISSING_ID = "cpu-missing"
+CPU_UNKNOWN_ID = "cpu-unknown"
+GPU_UNRESOLVED_IDS = frozenset({"gpu-discrete-unknown", "gpu-unlabeled"})
+
+_GPU_RTX_RE = re.compile(r"\brtx[\s\-]?(\d{3,4})(?:\s*(ti|super|max\-q|laptop)?)?\b")
+_GPU_GTX_RE = re.compile(r"\bgtx[\s\-]?(\d{3,4})(?:\s*(ti|super))?\b")
+_GPU_MX_RE = re.compile(r"\bmx[\s\-]?(\d{2,3})\b")
+_GPU_RX_RE = re.compile(r"\brx[\s\-]?(\d{3,4})(?:\s*([ms]|xt|xtx))?\b")
+_GPU_ARC_RE = re.compile(r"\barc[\s\-]?([a-z]?\d{3,4}m?)\b")
+_GPU_APPLE_RE = re.compile(r"\bm([1-4])\b")
+_GPU_UHD_RE = re.compile(r"\buhd\b")
+_GPU_RADEON_IGPU_RE = re.compile(r"radeon\s*(\d{3})m\b")
+_GPU_VEGA_RE = re.compile(r"\bvega\s*(8|7|6|3)\b")
+
+
+def _cpu_model_id(key: str) -> str:
+    """CPU_SCORES anahtarını kanonik kimliğe çevirir ("i7-13" -> "intel-i7-13", "ryzen 7 7" -> "amd-ryzen-7-7")."""
+    if key.startswith("ryzen"):
+        vendor = "amd"
+    elif key.startswith(("i", "ultra")):
+        vendor = "intel"
+    elif key.startswith("m"):
+        vendor = "apple"
+    else:
+        vendor = "cpu"
+    return f"{vendor}-" + "-".join(re.split(r"[\s\-]+", key.strip()))
+
+
+def _gpu_model(s: str) -> Tuple[str, str]:
+    """Küçük harfli GPU metnini (kanonik kimlik, etiket) ikilisine çevirir; kurallar öncelik sırasıyla denenir."""
+    m = _GPU_RTX_RE.search(s)
     if m:
         num = m.group(1)
-        return f"GeForce RTX {num}"
+        return f"nvidia-rtx-{num}", f"GeForce RTX {num}"
 
-    m = re.search(r"\bgtx[\s\-]?(\d{3,4})(?:\s*(ti|super))?\b", s)
+    m = _GPU_GTX_RE.search(s)
     if m:
         num = m.group(1)
         suf = m.group(2)
-        return f"GeForce GTX {num} {suf.upper()}" if suf else f"GeForce GTX {num}"
+        if suf:
+            return f"nvidia-gtx-{num}-{suf}", f"GeForce GTX {num} {suf.upper()}"
+        return f"nvidia-gtx-{num}", f"GeForce GTX {num}"
 
-    m = re.search(r"\bmx[\s\-]?(\d{2,3})\b", s)
+    m = _GPU_MX_RE.search(s)
     if m:
-        return f"NVIDIA MX {m.group(1)}"
+        return f"nvidia-mx-{m.group(1)}", f"NVIDIA MX {m.group(1)}"
 
-    m = re.search(r"\brx[\s\-]?(\d{3,4})(?:\s*([ms]|xt|xtx))?\b", s.replace(" ", ""))
+    m = _GPU_RX_RE.search(s.replace(" ", ""))
     if m:
         num = m.group(1)
         suf = m.group(2)
         if suf:
-            suf = suf.upper()
-            return f"Radeon RX {num}{suf}"
-        return f"Radeon RX {num}"
+            return f"amd-rx-{num}{suf}", f"Radeon RX {num}{suf.upper()}"
+        return f"amd-rx-{num}", f"Radeon RX {num}"
 
-    m = re.search(r"\barc[\s\-]?([a-z]?\d{3,4}m?)\b", s)
+    m = _GPU_ARC_RE.search(s)
     if m:
-        return f"Intel Arc {m.group(1).upper()}"
+        return f"intel-arc-{m.group(1)}", f"Intel Arc {m.group(1).upper()}"
 
-    m = re.search(r"\bm([1-4])\b", s)
+    m = _GPU_APPLE_RE.search(s)
     if m:
-        return f"Apple M{m.group(1)} GPU"
+        return f"apple-m{m.group(1)}-gpu", f"Apple M{m.group(1)} GPU"
 
     if "iris xe" in s:
-        return "Intel Iris Xe (iGPU)"
+        return "intel-iris-xe", "Intel Iris Xe (iGPU)"
     if "iris plus" in s:
-        return "Intel Iris Plus (iGPU)"
-    if "uhd graphics" in s or "hd graphics" in s or re.search(r"\buhd\b", s):
-        return "Intel UHD (iGPU)"
+        return "intel-iris-plus", "Intel Iris Plus (iGPU)"
+    if "uhd graphics" in s or "hd graphics" in s or _GPU_UHD_RE.search(s):
+        return "intel-uhd", "Intel UHD (iGPU)"
 
-    m = re.search(r"radeon\s*(\d{3})m\b", s)
+    m = _GPU_RADEON_IGPU_RE.search(s)
     if m:
-        return f"Radeon {m.group(1)}M (iGPU)"
-    m = re.search(r"\bvega\s*(8|7|6|3)\b", s)
+        return f"amd-radeon-{m.group(1)}m", f"Radeon {m.group(1)}M (iGPU)"
+    m = _GPU_VEGA_RE.search(s)
     if m:
-        return f"Radeon Vega {m.group(1)} (iGPU)"
+        return f"amd-vega-{m.group(1)}", f"Radeon Vega {m.group(1)} (iGPU)"
 
     if "integrated" in s or "igpu" in s or "apu graphics" in s:
-        return "Integrated (generic)"
+        return "integrated-generic", "Integrated (generic)"
 
     if "geforce" in s or "nvidia" in s or "radeon" in s:
-        return "Discrete GPU (Unknown)"
+        return "gpu-discrete-unknown", "Discrete GPU (Unknown)"
+
+    return "gpu-unlabeled", "GPU (Unlabeled)"
+
+
+class ModelResolver:
+    """
+    Ham CPU/GPU metnini tek geçişte kanonik model kimliğine çevirir, skoru
+    kimlik tablosundan okur. Sonuçlar metin başına önbelleğe alınır.
+
+    CPU: CPU_SCORES anahtarları ve genel seviye eşleşmeleri tek bir lookahead
+    alternation regex'inde toplanır; metindeki her konumdaki eşleşme görülür ve
+    tablo sırasında en önce gelen kazanır (tabloyu sırayla taramakla aynı sonuç).
+    HX/U/P eki kimliğe eklenir ("intel-i7-13-hx") ve skor düzeltmesi
+    cpu_models tablosunda önceden hesaplanır.
+
+    GPU: normalize kuralları derlenmiş regex'lerle bir kez çalışır; aynı ayrıştırma
+    hem etiketi hem skoru verir. Skor, kimlik başına bir kez hesaplanıp
+    gpu_models tablosunda tutulur.
+    """
+
+    def __init__(self, cpu_scores: Dict[str, float]):
+        self.cpu_models: Dict[str, float] = {CPU_MISSING_ID: 5.0, CPU_UNKNOWN_ID: 5.0}
+        self.gpu_models: Dict[str, float] = {}
+        self._cpu_targets: Dict[str, Tuple[str, bool]] = {}
+        priority: Dict[str, int] = {}
+
+        for key, score in cpu_scores.items():
+            model_id = _cpu_model_id(str(key))
+            self.cpu_models.setdefault(model_id, score)
+            self.cpu_models.setdefault(f"{model_id}-hx", min(10.0, score + 0.5))
+            self.cpu_models.setdefault(f"{model_id}-u", max(1.0, score - 1.0))
+            self.cpu_models.setdefault(f"{model_id}-p", score - 0.3)
+            if str(key) not in priority:
+                priority[str(key)] = len(priority)
+                self._cpu_targets[str(key)] = (model_id, True)
+        for keyword, model_id, score in _CPU_FALLBACKS:
+            self.cpu_models.setdefault(model_id, score)
+            if keyword not in priority:
+                priority[keyword] = len(priority)
+                self._cpu_targets[keyword] = (model_id, False)
+
+        self._cpu_priority = priority
+        keywords = sorted(priority, key=lambda kw: (priority[kw], -len(kw)))
+        self._cpu_pattern = re.compile("(?=(" + "|".join(re.escape(kw) for kw in keywords) + "))")
+        self.resolve_cpu = lru_cache(maxsize=4096)(self._resolve_cpu)
+        self.resolve_gpu = lru_cache(maxsize=4096)(self._resolve_gpu)
+
+    def _resolve_cpu(self, cpu_lower: str) -> str:
+        """Küçük harfli CPU metninin kanonik kimliği."""
+        best = len(self._cpu_priority)
+        keyword = None
+        for found in self._cpu_pattern.finditer(cpu_lower):
+            rank = self._cpu_priority[found.group(1)]
+            if rank < best:
+                best, keyword = rank, found.group(1)
+                if best == 0:
+                    break
+        if keyword is None:
+            return CPU_UNKNOWN_ID
+
+        model_id, has_variants = self._cpu_targets[keyword]
+        if not has_variants:
+            return model_id
+        if "hx" in cpu_lower:
+            return f"{model_id}-hx"
+        if " u" in cpu_lower or "-u" in cpu_lower:
+            return f"{model_id}-u"
+        if " p" in cpu_lower or "-p" in cpu_lower:
+            return f"{model_id}-p"
+        return model_id
+
+    def _resolve_gpu(self, gpu_lower: str) -> Tuple[str, str]:
+        """Küçük harfli GPU metninin (kimlik, etiket) ikilisi; skor tablosunu da doldurur."""
+        model_id, label = _gpu_model(gpu_lower)
+        if model_id not in self.gpu_models:
+            self.gpu_models[model_id] = get_gpu_score(label)
+        return model_id, label
+
+    def cpu(self, cpu_text: str | float | None) -> Tuple[str, float]:
+        """(kanonik kimlik, skor); eksik değer için CPU_MISSING_ID."""
+        if pd.isna(cpu_text):
+            return CPU_MISSING_ID, self.cpu_models[CPU_MISSING_ID]
+        model_id = self.resolve_cpu(str(cpu_text).lower())
+        return model_id, self.cpu_models[model_id]
+
+    def gpu(self, gpu_text: str | float | None) -> Tuple[str, str, float]:
+        """(kanonik kimlik, etiket, skor); boş değer genel entegre GPU sayılır."""
+        if pd.isna(gpu_text) or str(gpu_text).strip() == "":
+            model_id, label = self.resolve_gpu("integrated")
+        else:
+            model_id, label = self.resolve_gpu(str(gpu_text).lower().strip())
+        return model_id, label, self.gpu_models[model_id]
+
+
+# Çözümleyicinin okuduğu tablolar (CPU_SCORES ve get_gpu_score'un GPU tabloları).
+RESOLVER_TABLES = ("CPU_SCORES", "GPU_SCORES", "RTX_MODEL_SCORES", "GTX_MODEL_SCORES", "MX_MODEL_SCORES", "RX_MODEL_SCORES")
+
+_RESOLVER: ModelResolver | None = None
+_RESOLVER_TABLES: Tuple | None = None
+
+
+def _resolver_snapshot() -> Tuple:
+    """RESOLVER_TABLES içeriğinin karşılaştırılabilir kopyası."""
+    return tuple(tuple(SCORING_TABLES[name].items()) for name in RESOLVER_TABLES)
+
+
+def model_resolver() -> ModelResolver:
+    """
+    Derlenmiş çözümleyiciyi döndürür; ilk çağrıda kurulur, sonrasında O(1).
+    CPU/GPU tabloları çalışma anında değiştirilirse reset_model_resolver veya
+    sync_model_resolver çağrılmalıdır.
+    """
+    global _RESOLVER, _RESOLVER_TABLES
+    if _RESOLVER is None:
+        _RESOLVER_TABLES = _resolver_snapshot()
+        _RESOLVER = ModelResolver(CPU_SCORES)
+    return _RESOLVER
+
+
+def reset_model_resolver() -> None:
+    """Çözümleyiciyi ve önbelleklerini bırakır; sonraki çağrı güncel tablolarla yeniden kurar."""
+    global _RESOLVER, _RESOLVER_TABLES
+    _RESOLVER = None
+    _RESOLVER_TABLES = None
+
+
+def sync_model_resolver() -> bool:
+    """
+    RESOLVER_TABLES kurulumdan beri değiştiyse çözümleyiciyi sıfırlar (True döner).
+    Katalog hazırlanırken bir kez çağrılır; tekil sorgular bu karşılaştırmayı ödemez.
+    """
+    if _RESOLVER is not None and _resolver_snapshot() != _RESOLVER_TABLES:
+        reset_model_resolver()
+        return True
+    return False
+
+
+def resolve_cpu_model(cpu_text: str | float | None) -> Tuple[str, float]:
+    """CPU metnini (kanonik kimlik, skor) ikilisine çevirir, ör. ("intel-i7-13-hx", 8.5)."""
+    return model_resolver().cpu(cpu_text)
+
+
+def resolve_gpu_model(gpu_text: str | float | None) -> Tuple[str, str, float]:
+    """GPU metnini (kanonik kimlik, etiket, skor) üçlüsüne çevirir, ör. ("nvidia-rtx-4060", "GeForce RTX 4060", 8.0)."""
+    return model_resolver().gpu(gpu_text)
 
-    return "GPU (Unlabeled)"
+
+def cpu_model_id(cpu_text: str | float | None) -> str:
+    """resolve_cpu_model kimliği."""
+    return resolve_cpu_model(cpu_text)[0]
+
+
+def gpu_model_id(gpu_text: str | float | None) -> str:
+    """resolve_gpu_model kimliği."""
+    return resolve_gpu_model(gpu_text)[0]
+
+
+def gpu_model_score(gpu_text: str | float | None) -> float:
+    """Ham GPU metninin skoru; get_gpu_score(normalize_gpu_model(metin)) ile aynıdır."""
+    return resolve_gpu_model(gpu_text)[2]
+
+
+def unresolved_models(df: pd.DataFrame) -> Dict[str, Dict[str, int]]:
+    """
+    cpu_model/gpu_model kolonları olan bir katalogda çözümlenemeyen ham
+    CPU/GPU metinlerini satır sayılarıyla döndürür.
+    """
+    report: Dict[str, Dict[str, int]] = {"cpu": {}, "gpu": {}}
+    if "cpu_model" in df.columns and "cpu" in df.columns:
+        mask = (df["cpu_model"] == CPU_UNKNOWN_ID).to_numpy()
+        counts = df.loc[mask, "cpu"].astype(str).value_counts()
+        report["cpu"] = {str(text): int(count) for text, count in counts.items()}
+    if "gpu_model" in df.columns and "gpu" in df.columns:
+        mask = df["gpu_model"].isin(GPU_UNRESOLVED_IDS).to_numpy()
+        counts = df.loc[mask, "gpu"].astype(str).value_counts()
+        report["gpu"] = {str(text): int(count) for text, count in counts.items()}
+    return report
 
 
 def _cpu_suffix(cpu_text: str) -> str:
@@ -673,6 +899,67 @@ def get_dynamic_weights(usage_key: str) -> Dict[str, float]:
     return weights
 
 
+def _performance_weights(usage_key: str, prod_profile: str) -> Tuple[float, float]:
+    """Kullanım amacına göre (cpu_w, gpu_w) performans ağırlıklarını döndürür."""
+    cpu_w, gpu_w = 0.7, 0.3
+    if usage_key == "gaming":
+        cpu_w, gpu_w = 0.3, 0.7
+    elif usage_key == "design":
+        cpu_w, gpu_w = 0.5, 0.5
+    elif usage_key == "portability":
+        cpu_w, gpu_w = 0.8, 0.2
+    elif usage_key in ["dev", "productivity"]:
+        # Ported from main_recommender.py: multitask üretkenlikte CPU'ya daha fazla ağırlık ver
+        if usage_key == "productivity" and prod_profile == "multitask":
+            cpu_w, gpu_w = 0.85, 0.15
+    return cpu_w, gpu_w
+
+
+def _cpu_battery_delta(cpu_text: str) -> int:
+    """CPU tipinin (Apple M, U/P/H/HX, Ryzen, Ultra) pil puanına etkisini döndürür."""
+    cpu_text = cpu_text.lower()
+    if any(x in cpu_text for x in ["m1", "m2", "m3", "m4"]):
+        return 30
+    if re.search(r"i[3579]-\d+u", cpu_text) or cpu_text.endswith("-u"):
+        return 20
+    if re.search(r"i[3579]-\d+p", cpu_text) or "-p" in cpu_text:
+        return 10
+    if "hx" in cpu_text or cpu_text.endswith("-hx"):
+        return -20
+    if re.search(r"i[3579]-\d+h(?!x)", cpu_text) or cpu_text.endswith("-h") or " h " in cpu_text:
+        return -10
+    if "ryzen" in cpu_text and (" u" in cpu_text or cpu_text.endswith("u")):
+        return 20
+    if "ryzen" in cpu_text and "hs" in cpu_text:
+        return 5
+    if "ryzen" in cpu_text and (
+        "hx" in cpu_text or ((" h" in cpu_text or cpu_text.endswith("h")) and "hs" not in cpu_text)
+    ):
+        return -15
+    if "ultra" in cpu_text:
+        return 15
+    return 0
+
+
+def _os_multiplier(usage_key: str, os_val: Any) -> float:
+    """Kullanım amacına göre işletim sistemi çarpanını döndürür."""
+    if usage_key in ["design", "dev"]:
+        if os_val == "macos":
+            return 1.05
+        if os_val == "windows":
+            return 1.03
+        if os_val == "linux":
+            return 1.02
+        if os_val == "freedos":
+            return 0.95
+    elif usage_key == "productivity":
+        if os_val in ["windows", "macos"]:
+            return 1.02
+        if os_val == "freedos":
+            return 0.97
+    return 1.0
+
+
 def calculate_score(row: pd.Series, preferences: Dict[str, Any]) -> Tuple[float, str]:
     """Tek bir laptop satırı için toplam puanı ve açıklamasını döndürür."""
     score_parts: Dict[str, float] = {}
@@ -700,17 +987,7 @@ def calculate_score(row: pd.Series, preferences: Dict[str, Any]) -> Tuple[float,
 
     cpu_score = row.get("cpu_score", 5.0)
     gpu_score = row.get("gpu_score", 3.0)
-    cpu_w, gpu_w = 0.7, 0.3
-    if usage_key == "gaming":
-        cpu_w, gpu_w = 0.3, 0.7
-    elif usage_key == "design":
-        cpu_w, gpu_w = 0.5, 0.5
-    elif usage_key == "portability":
-        cpu_w, gpu_w = 0.8, 0.2
-    elif usage_key in ["dev", "productivity"]:
-        # Ported from main_recommender.py: multitask üretkenlikte CPU'ya daha fazla ağırlık ver
-        if usage_key == "productivity" and prod_profile == "multitask":
-            cpu_w, gpu_w = 0.85, 0.15
+    cpu_w, gpu_w = _performance_weights(usage_key, prod_profile)
     perf_score = (cpu_score * cpu_w + gpu_score * gpu_w) * 10
     score_parts["performance"] = perf_score * weights["performance"] / 100
 
@@ -752,28 +1029,7 @@ def calculate_score(row: pd.Series, preferences: Dict[str, Any]) -> Tuple[float,
     score_parts["brand_purpose"] = brand_purpose * weights["brand_purpose"] / 100
 
     screen_size = row.get("screen_size", 15.6)
-    battery_score = 50
-    cpu_text = str(row.get("cpu", "")).lower()
-    if any(x in cpu_text for x in ["m1", "m2", "m3", "m4"]):
-        battery_score += 30
-    elif re.search(r"i[3579]-\d+u", cpu_text) or cpu_text.endswith("-u"):
-        battery_score += 20
-    elif re.search(r"i[3579]-\d+p", cpu_text) or "-p" in cpu_text:
-        battery_score += 10
-    elif "hx" in cpu_text or cpu_text.endswith("-hx"):
-        battery_score -= 20
-    elif re.search(r"i[3579]-\d+h(?!x)", cpu_text) or cpu_text.endswith("-h") or " h " in cpu_text:
-        battery_score -= 10
-    elif "ryzen" in cpu_text and (" u" in cpu_text or cpu_text.endswith("u")):
-        battery_score += 20
-    elif "ryzen" in cpu_text and "hs" in cpu_text:
-        battery_score += 5
-    elif "ryzen" in cpu_text and (
-        "hx" in cpu_text or ((" h" in cpu_text or cpu_text.endswith("h")) and "hs" not in cpu_text)
-    ):
-        battery_score -= 15
-    elif "ultra" in cpu_text:
-        battery_score += 15
+    battery_score = 50 + _cpu_battery_delta(str(row.get("cpu", "")))
 
     if gpu_score < 3:
         battery_score += 15
@@ -802,24 +1058,7 @@ def calculate_score(row: pd.Series, preferences: Dict[str, Any]) -> Tuple[float,
     portability_score = max(0, min(100, portability_score))
     score_parts["portability"] = portability_score * weights["portability"] / 100
 
-    os_val = row.get("os", "freedos")
-    os_multiplier = 1.0
-    if usage_key == "gaming":
-        os_multiplier = 1.0
-    elif usage_key in ["design", "dev"]:
-        if os_val == "macos":
-            os_multiplier = 1.05
-        elif os_val == "windows":
-            os_multiplier = 1.03
-        elif os_val == "linux":
-            os_multiplier = 1.02
-        elif os_val == "freedos":
-            os_multiplier = 0.95
-    elif usage_key == "productivity":
-        if os_val in ["windows", "macos"]:
-            os_multiplier = 1.02
-        elif os_val == "freedos":
-            os_multiplier = 0.97
+    os_multiplier = _os_multiplier(usage_key, row.get("os", "freedos"))
 
     total_score = sum(score_parts.values()) * os_multiplier
     total_score = min(100.0, max(0.0, total_score))
@@ -834,135 +1073,620 @@ def calculate_score(row: pd.Series, preferences: Dict[str, Any]) -> Tuple[float,
     return total_score, breakdown
 
 
+# =============================================================================
+# Vektörel skorlama
+# =============================================================================
+
+SCORE_PARTS: Tuple[str, ...] = (
+    "price",
+    "performance",
+    "ram",
+    "storage",
+    "brand",
+    "brand_purpose",
+    "battery",
+    "portability",
+)
+
+
+def _numeric_column(df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+    """Kolonu float64 dizi olarak döndürür; kolon yoksa row.get gibi default ile doldurur."""
+    if column in df.columns:
+        return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.full(len(df), default, dtype=np.float64)
+
+
+def _distinct_values(df: pd.DataFrame, column: str, default: Any) -> Tuple[np.ndarray, List[Any]]:
+    """Kolonu (kodlar, farklı değerler) olarak ayrıştırır; kolon yoksa tek değer default olur."""
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=np.intp), [default]
+    codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+    return codes, list(uniques)
+
+
+def _map_distinct(distinct: Tuple[np.ndarray, List[Any]], func, dtype=np.float64) -> np.ndarray:
+    """func'ı her farklı değer için bir kez çalıştırıp sonucu satırlara yayar."""
+    codes, uniques = distinct
+    return np.array([func(value) for value in uniques], dtype=dtype)[codes]
+
+
+def _py_max(low: float, values: np.ndarray) -> np.ndarray:
+    """Python max(low, v) ile aynı sonuç (NaN için low döner)."""
+    return np.where(values > low, values, low)
+
+
+def _py_min(high: float, values: np.ndarray) -> np.ndarray:
+    """Python min(high, v) ile aynı sonuç (NaN için high döner)."""
+    return np.where(values < high, values, high)
+
+
+# Sorgudan bağımsız cihaz özellikleri; hazır katalogda kolon olarak tutulur.
+STATIC_FEATURE_COLUMNS: Tuple[str, ...] = (
+    "cpu_suffix",
+    "has_dgpu",
+    "is_cuda",
+    "rtx_tier",
+    "is_apple_gpu",
+    "battery_score",
+    "portability_score",
+)
+
+
+def compute_static_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    CPU/GPU metninden ve ekran boyutundan türeyen, sorgudan bağımsız özellikleri hesaplar.
+    Metin türevli değerler farklı değer başına bir kez hesaplanır.
+    """
+    cpus = _distinct_values(df, "cpu", "")
+    gpus = _distinct_values(df, "gpu_norm", "")
+    gpu_score = _numeric_column(df, "gpu_score", 3.0)
+    screen_size = _numeric_column(df, "screen_size", 15.6)
+
+    battery_score = 50 + _map_distinct(cpus, lambda value: _cpu_battery_delta(str(value)))
+    battery_score = battery_score + np.select([gpu_score < 3, gpu_score > 7, gpu_score > 5], [15.0, -20.0, -10.0], 0.0)
+
+    portability_score = 50 + np.select(
+        [screen_size <= 13, screen_size <= 14, screen_size <= 15, screen_size >= 17],
+        [40.0, 30.0, 10.0, -30.0],
+        -10.0,
+    )
+    portability_score = portability_score + np.select([gpu_score < 3, gpu_score > 7], [10.0, -15.0], 0.0)
+
+    return {
+        "cpu_suffix": _map_distinct(cpus, lambda value: _cpu_suffix(str(value)), dtype=object),
+        "has_dgpu": _map_distinct(gpus, lambda value: _has_dgpu(str(value)), dtype=bool),
+        "is_cuda": _map_distinct(gpus, lambda value: _is_nvidia_cuda(str(value)), dtype=bool),
+        "rtx_tier": _map_distinct(gpus, lambda value: _rtx_tier(str(value)), dtype=np.int16),
+        "is_apple_gpu": _map_distinct(
+            gpus,
+            lambda value: any(k in str(value).lower() for k in ["apple m1", "apple m2", "apple m3", "apple m4"]),
+            dtype=bool,
+        ),
+        "battery_score": np.clip(battery_score, 0, 100),
+        "portability_score": np.clip(portability_score, 0, 100),
+    }
+
+
+def add_static_features(df: pd.DataFrame) -> pd.DataFrame:
+    """STATIC_FEATURE_COLUMNS kolonlarını (yerinde) ekler; katalog hazırlanırken bir kez çağrılır."""
+    for column, values in compute_static_features(df).items():
+        df[column] = values
+    return df
+
+
+def _static_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Hazır kolonlar varsa onları okur, yoksa özellikleri metinden hesaplar."""
+    if not all(column in df.columns for column in STATIC_FEATURE_COLUMNS):
+        return compute_static_features(df)
+    features = {column: df[column].to_numpy() for column in STATIC_FEATURE_COLUMNS}
+    features["cpu_suffix"] = df["cpu_suffix"].to_numpy(dtype=object)
+    features["rtx_tier"] = features["rtx_tier"].astype(np.int64)
+    features["battery_score"] = features["battery_score"].astype(np.float64)
+    features["portability_score"] = features["portability_score"].astype(np.float64)
+    return features
+
+
+# Her geliştirme profili için hazır katalogda tutulan uygunluk kolonu.
+DEV_FIT_COLUMNS: Dict[str, str] = {dev_mode: f"dev_fit_{dev_mode}" for dev_mode in DEV_PRESETS}
+
+
+def _dev_fit_inputs(df: pd.DataFrame) -> Dict[str, Any]:
+    """compute_dev_fit'in profilden bağımsız girdilerini bir kez hazırlar."""
+    ram = _numeric_column(df, "ram_gb", 8.0)
+    ssd = _numeric_column(df, "ssd_gb", 256.0)
+    base_gpu = _numeric_column(df, "gpu_score", 3.0)
+    screen = _numeric_column(df, "screen_size", 15.6)
+    features = _static_features(df)
+    suffix_codes, suffixes = pd.factorize(features["cpu_suffix"])
+    return {
+        "ram": np.where(ram == 0, 8.0, ram),
+        "ssd": np.where(ssd == 0, 256.0, ssd),
+        "base_gpu": np.where(base_gpu == 0, 3.0, base_gpu),
+        "screen": np.where(screen == 0, 15.6, screen),
+        "suffixes": (suffix_codes, list(suffixes)),
+        "os": _distinct_values(df, "os", "freedos"),
+        "has_dgpu": features["has_dgpu"],
+        "is_cuda": features["is_cuda"],
+        "tier": features["rtx_tier"],
+        "is_apple": features["is_apple_gpu"],
+    }
+
+
+def _dev_fit(inputs: Dict[str, Any], dev_mode: str) -> np.ndarray:
+    """Hazır girdilerden tek bir profil için compute_dev_fit sonuçlarını hesaplar."""
+    preset = DEV_PRESETS.get(dev_mode, DEV_PRESETS["general"])
+    ram, ssd, base_gpu, screen = inputs["ram"], inputs["ssd"], inputs["base_gpu"], inputs["screen"]
+    has_dgpu = inputs["has_dgpu"]
+    is_cuda = inputs["is_cuda"]
+    tier = inputs["tier"]
+    is_apple = inputs["is_apple"]
+    cpu_bias = _map_distinct(inputs["suffixes"], lambda suffix: max(0.0, preset["cpu_bias"].get(suffix, 0.0)))
+    os_mult = _map_distinct(inputs["os"], lambda value: preset["prefer_os"].get(str(value).lower(), 0.98))
+
+    score = 0.0 + _py_min(1.0, ram / preset["min_ram"]) * 20
+    score = score + _py_min(1.0, ssd / preset["min_ssd"]) * 15
+    score = score + cpu_bias * 4
+    parts = 0.0 + 20 + 15 + 4 + 25 + 20
+
+    gpu_pts = _py_min(1.0, base_gpu / 8.0) * 20
+    if dev_mode == "ml":
+        gpu_pts = gpu_pts + np.select([tier >= 4060, tier >= 4050, has_dgpu], [5.0, 3.0, 1.0], 0.0)
+    if dev_mode == "gamedev":
+        gpu_pts = gpu_pts + np.select([tier >= 4070, tier >= 4060, tier >= 4050], [6.0, 4.0, 2.0], 0.0)
+    if dev_mode in ["web", "general"]:
+        gpu_pts = np.where(has_dgpu, gpu_pts - 1.5, gpu_pts)
+    if dev_mode == "mobile":
+        gpu_pts = np.where(has_dgpu, gpu_pts - 2.5, gpu_pts)
+    gpu_pts = _py_max(0.0, _py_min(25.0, gpu_pts))
+    score = score + gpu_pts
+
+    port_bias = preset["port_bias"]
+    port_bonus = np.select(
+        [screen <= 13.6, screen <= 14.5, screen <= 15.6, screen > 16],
+        [
+            port_bias.get("<=13.6", 0.0),
+            port_bias.get("<=14.5", port_bias.get("<=14", 0.0)),
+            port_bias.get("<=15.6", 0.0),
+            port_bias.get(">16", -0.2),
+        ],
+        port_bias.get("15-16", 0.0),
+    )
+    size_ok = np.where(screen <= preset["screen_max"], 1.0, 0.7)
+    score = score + (size_ok * 10 + (port_bonus * 10))
+    score = score * os_mult
+
+    if dev_mode in ["mobile", "general", "web"]:
+        score = np.where(is_apple, score + 3.0, score)
+
+    scaled = np.clip((score / parts) * 100, 0.0, 100.0)
+    blocked = np.zeros(len(ram), dtype=bool)
+    if preset["need_dgpu"]:
+        blocked |= ~has_dgpu
+    if preset["need_cuda"]:
+        blocked |= ~is_cuda
+    return np.where(blocked, 0.0, scaled)
+
+
+def dev_fit_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tüm cihazlar x DEV_PRESETS profilleri için compute_dev_fit matrisi.
+    Kolon adları DEV_FIT_COLUMNS'tadır; profilden bağımsız girdiler bir kez hazırlanır.
+    """
+    inputs = _dev_fit_inputs(df)
+    return pd.DataFrame(
+        {column: _dev_fit(inputs, dev_mode) for dev_mode, column in DEV_FIT_COLUMNS.items()},
+        index=df.index,
+    )
+
+
+def add_dev_fit_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """dev_fit_matrix kolonlarını (yerinde) ekler; katalog hazırlanırken bir kez çağrılır."""
+    for column, values in dev_fit_matrix(df).items():
+        df[column] = values.to_numpy()
+    return df
+
+
+def dev_fit_array(df: pd.DataFrame, dev_mode: str) -> np.ndarray:
+    """
+    compute_dev_fit'in tüm DataFrame için vektörel karşılığı.
+    Hazır katalogda profilin kolonu okunur; yoksa (veya profil tanımsızsa) hesaplanır.
+    """
+    column = DEV_FIT_COLUMNS.get(dev_mode)
+    if column is not None and column in df.columns:
+        return df[column].to_numpy(dtype=np.float64)
+    return _dev_fit(_dev_fit_inputs(df), dev_mode)
+
+
+# Bütçeden bağımsız kısmi skorun hazır katalogda tutulduğu kolonlar: kolon -> (usage_key, productivity_profile).
+PARTIAL_SCORE_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "partial_gaming": ("gaming", "office"),
+    "partial_portability": ("portability", "office"),
+    "partial_productivity": ("productivity", "office"),
+    "partial_productivity_multitask": ("productivity", "multitask"),
+    "partial_design": ("design", "office"),
+    "partial_dev": ("dev", "office"),
+}
+
+
+def _partial_column(usage_key: str, prod_profile: str) -> str | None:
+    """Kullanım amacı/profil için PARTIAL_SCORE_COLUMNS kolon adı; tanımsız amaçlar için None."""
+    if usage_key == "productivity" and prod_profile == "multitask":
+        return "partial_productivity_multitask"
+    column = f"partial_{usage_key}"
+    return column if column in PARTIAL_SCORE_COLUMNS else None
+
+
+def price_part(df: pd.DataFrame, preferences: Dict[str, Any]) -> np.ndarray:
+    """Sorguya bağlı tek bileşen: bütçe aralığına göre ağırlıklı fiyat puanı."""
+    weights = get_dynamic_weights(preferences.get("usage_key", "productivity"))
+    price = df["price"].to_numpy(dtype=np.float64, na_value=np.nan)
+    min_b = float(preferences["min_budget"])
+    max_b = float(preferences["max_budget"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price_range = max_b - min_b
+        if price_range > 0:
+            in_score = 100 * (1 - (price - min_b) / price_range)
+            distance = np.abs(price - (min_b + max_b) / 2) / (price_range / 2)
+        else:
+            in_score = np.full(len(df), 100.0)
+            distance = np.zeros(len(df))
+        mid_bonus = _py_max(0.0, (1 - distance) * 4)
+        in_score = _py_min(100.0, in_score * 0.95 + mid_bonus)
+        penalty = np.where(price < min_b, (min_b - price) / min_b, (price - max_b) / max_b)
+        out_score = _py_max(0.0, 50 * (1 - penalty))
+    price_score = np.where((price >= min_b) & (price <= max_b), in_score, out_score)
+    return price_score * weights["price"] / 100
+
+
+def budget_free_parts(df: pd.DataFrame, usage_key: str, prod_profile: str = "office") -> Dict[str, np.ndarray]:
+    """Fiyat dışındaki ağırlıklı bileşenler (SCORE_PARTS sırasıyla); yalnızca cihaza ve kullanım amacına bağlıdır."""
+    weights = get_dynamic_weights(usage_key)
+    parts: Dict[str, np.ndarray] = {}
+
+    cpu_score = _numeric_column(df, "cpu_score", 5.0)
+    gpu_score = _numeric_column(df, "gpu_score", 3.0)
+    cpu_w, gpu_w = _performance_weights(usage_key, prod_profile)
+    parts["performance"] = (cpu_score * cpu_w + gpu_score * gpu_w) * 10 * weights["performance"] / 100
+
+    ram_gb = _numeric_column(df, "ram_gb", 8.0)
+    ram_score = np.select(
+        [ram_gb >= 64, ram_gb >= 32, ram_gb >= 24, ram_gb >= 16, ram_gb >= 12, ram_gb >= 8],
+        [100.0, 90.0, 80.0, 70.0, 55.0, 40.0],
+        20.0,
+    )
+    parts["ram"] = ram_score * weights["ram"] / 100
+
+    ssd_gb = _numeric_column(df, "ssd_gb", 256.0)
+    storage_score = np.select(
+        [ssd_gb >= 2048, ssd_gb >= 1024, ssd_gb >= 512, ssd_gb >= 256],
+        [100.0, 85.0, 70.0, 50.0],
+        30.0,
+    )
+    parts["storage"] = storage_score * weights["storage"] / 100
+
+    brands = _distinct_values(df, "brand", "other")
+    brand_score = _map_distinct(brands, lambda value: BRAND_SCORES.get(value, 5.0) * 10)
+    parts["brand"] = brand_score * weights["brand"] / 100
+    brand_purpose = _map_distinct(brands, lambda value: BRAND_PARAM_SCORES.get(value, {}).get(usage_key, 70))
+    parts["brand_purpose"] = brand_purpose * weights["brand_purpose"] / 100
+
+    features = _static_features(df)
+    parts["battery"] = features["battery_score"] * weights["battery"] / 100
+    parts["portability"] = features["portability_score"] * weights["portability"] / 100
+    return parts
+
+
+# Fiyat dışındaki bileşenler (partial_* kolonlarının toplandığı sıra).
+BUDGET_FREE_PARTS: Tuple[str, ...] = tuple(name for name in SCORE_PARTS if name != "price")
+# score_array ile score_frame/calculate_score arasındaki en büyük fark: kısmi skor önceden
+# toplandığı için toplama sırası değişir, skorlar yalnızca son bitlerde ayrışabilir.
+SCORE_ARRAY_TOLERANCE = 1e-9
+
+
+def _sum_parts(parts: Dict[str, np.ndarray], names: Tuple[str, ...] = SCORE_PARTS) -> np.ndarray:
+    """Verilen bileşenleri calculate_score ile aynı sırada (soldan sağa) toplar."""
+    total = parts[names[0]]
+    for name in names[1:]:
+        total = total + parts[name]
+    return total
+
+
+def partial_score_array(df: pd.DataFrame, usage_key: str, prod_profile: str = "office") -> np.ndarray:
+    """Bütçeden bağımsız kısmi skor; hazır katalogda partial_* kolonundan okunur, yoksa hesaplanır."""
+    column = _partial_column(usage_key, prod_profile)
+    if column is not None and column in df.columns:
+        return df[column].to_numpy(dtype=np.float64)
+    return _sum_parts(budget_free_parts(df, usage_key, prod_profile), BUDGET_FREE_PARTS)
+
+
+def add_partial_score_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """PARTIAL_SCORE_COLUMNS kolonlarını (yerinde) ekler; katalog hazırlanırken bir kez çağrılır."""
+    for column, (usage_key, prod_profile) in PARTIAL_SCORE_COLUMNS.items():
+        df[column] = _sum_parts(budget_free_parts(df, usage_key, prod_profile), BUDGET_FREE_PARTS)
+    return df
+
+
+def _finish_score(df: pd.DataFrame, preferences: Dict[str, Any], parts_total: np.ndarray) -> np.ndarray:
+    """Bileşen toplamına işletim sistemi çarpanı, sınırlama ve dev karışımı uygulanır."""
+    usage_key = preferences.get("usage_key", "productivity")
+    os_multiplier = _map_distinct(_distinct_values(df, "os", "freedos"), lambda value: _os_multiplier(usage_key, value))
+    total = _py_min(100.0, _py_max(0.0, parts_total * os_multiplier))
+
+    if usage_key == "dev":
+        dev_fit = dev_fit_array(df, preferences.get("dev_mode", "general"))
+        total = _py_min(100.0, _py_max(0.0, 0.7 * total + 0.3 * dev_fit))
+    return total
+
+
+def score_array(df: pd.DataFrame, preferences: Dict[str, Any]) -> np.ndarray:
+    """
+    Sorgu yolu: yalnızca fiyat terimi hesaplanır, geri kalanı hazır kısmi skordan okunur.
+    Kısmi skor önceden toplandığından sonuç score_frame(df, preferences)["score"] ile
+    birebir değil, SCORE_ARRAY_TOLERANCE içinde aynıdır.
+    """
+    usage_key = preferences.get("usage_key", "productivity")
+    prod_profile = preferences.get("productivity_profile", "office")
+    return _finish_score(df, preferences, price_part(df, preferences) + partial_score_array(df, usage_key, prod_profile))
+
+
+def score_frame(df: pd.DataFrame, preferences: Dict[str, Any]) -> pd.DataFrame:
+    """
+    calculate_score'un tüm DataFrame üzerinde vektörel karşılığı.
+    SCORE_PARTS sırasıyla ağırlıklı bileşenleri ve toplam "score" kolonunu döndürür;
+    değerler satır satır calculate_score ile birebir aynıdır.
+    """
+    usage_key = preferences.get("usage_key", "productivity")
+    prod_profile = preferences.get("productivity_profile", "office")
+    parts = {"price": price_part(df, preferences)}
+    parts.update(budget_free_parts(df, usage_key, prod_profile))
+
+    result = pd.DataFrame(parts, index=df.index)
+    result["score"] = _finish_score(df, preferences, _sum_parts(parts))
+    return result
+
+
+def format_breakdown(parts: pd.DataFrame) -> List[str]:
+    """score_frame bileşenlerinden calculate_score ile aynı açıklama metnini üretir."""
+    return [
+        " | ".join(f"{name}:{value:.1f}" for name, value in zip(SCORE_PARTS, values))
+        for values in parts[list(SCORE_PARTS)].to_numpy()
+    ]
+
+
+# Ön filtresi tanımlı kullanım amaçları (build_filter_index bunların vektörlerini önceden hesaplar).
+USAGE_FILTER_KEYS = ("gaming", "portability", "productivity", "design", "dev")
+
+
+def _preset_mask(index: BitmapIndex, usage_key: str, preferences: Dict[str, Any]) -> np.ndarray:
+    """Kullanım amacının satır sayısından bağımsız ön filtre vektörü; index içinde saklanır."""
+    min_needed = float(preferences.get("min_gpu_score_required", 6.0))
+    dev_mode = preferences.get("dev_mode", "general")
+
+    def build() -> np.ndarray:
+        mask = index.all()
+        if usage_key == "gaming":
+            if index.has("gpu_score"):
+                mask = mask & index.at_least("gpu_score", min_needed)
+            if index.has("ram_gb"):
+                mask = mask & index.at_least("ram_gb", 8)
+
+        elif usage_key == "portability":
+            if index.has("screen_size"):
+                mask = mask & index.at_most("screen_size", 14.5)
+
+        elif usage_key == "productivity":
+            if index.has("ram_gb"):
+                mask = mask & index.at_least("ram_gb", 8)
+            if index.has("cpu_score"):
+                mask = mask & index.at_least("cpu_score", 5.0)
+
+        elif usage_key == "design":
+            if index.has("ram_gb"):
+                mask = mask & index.at_least("ram_gb", 16)
+            if index.has("gpu_score"):
+                mask = mask & index.at_least("gpu_score", 4.0)
+            if index.has("screen_size"):
+                mask = mask & index.at_least("screen_size", 14.0)
+
+        elif usage_key == "dev":
+            if index.has("ram_gb"):
+                mask = mask & index.at_least("ram_gb", 16)
+            if index.has("cpu_score"):
+                mask = mask & index.at_least("cpu_score", 6.0)
+            if index.has("ssd_gb"):
+                mask = mask & index.at_least("ssd_gb", 256)
+
+            preset = DEV_PRESETS.get(dev_mode, DEV_PRESETS["general"])
+            if index.has("ram_gb"):
+                mask = mask & index.at_least("ram_gb", preset["min_ram"])
+            if index.has("ssd_gb"):
+                mask = mask & index.at_least("ssd_gb", preset["min_ssd"])
+            if index.has("screen_size"):
+                mask = mask & index.at_most("screen_size", preset["screen_max"])
+
+            if preset.get("need_dgpu") or preset.get("need_cuda"):
+                if index.has("has_dgpu") and index.has("is_cuda"):
+                    mask = mask & index.flag("has_dgpu")
+                    if preset.get("need_cuda"):
+                        mask = mask & index.flag("is_cuda")
+                elif index.has("gpu_norm"):
+                    mask = mask & index.where("gpu_norm", _has_dgpu)
+                    if preset.get("need_cuda"):
+                        mask = mask & index.where("gpu_norm", _is_nvidia_cuda)
+        return mask
+
+    key = ("usage", usage_key, min_needed if usage_key == "gaming" else None, dev_mode if usage_key == "dev" else None)
+    return index.cached(key, build)
+
+
+def usage_mask(
+    index: BitmapIndex, usage_key: str, preferences: Dict[str, Any], rows: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    filter_by_usage'ın vektör karşılığı: rows konumlarındaki (verilmezse tüm) satırlardan
+    kullanım amacına uyanları işaretler; dönen vektör rows ile hizalıdır. Satır sayısına
+    bağlı adımlar (taşınabilirlikte GPU eşiği, az sonuç kalınca gevşetme) rows içinde sayılır.
+    """
+    def pick(vector: np.ndarray) -> np.ndarray:
+        return vector if rows is None else vector[rows]
+
+    mask = pick(_preset_mask(index, usage_key, preferences))
+
+    if usage_key == "portability":
+        count = int(mask.sum())
+        if count > 50 and index.has("gpu_score"):
+            mask = mask & pick(index.at_most("gpu_score", 5.0))
+        elif count > 30 and index.has("gpu_score"):
+            mask = mask & pick(index.at_most("gpu_score", 6.0))
+
+    total = len(index) if rows is None else len(rows)
+    if int(mask.sum()) < 5 and total > 5:
+        if usage_key == "gaming" and index.has("gpu_score"):
+            return pick(index.at_least("gpu_score", 5.0))
+        if usage_key == "portability" and index.has("screen_size"):
+            return pick(index.at_most("screen_size", 15.6))
+        if usage_key in ["design", "dev"] and index.has("ram_gb"):
+            return pick(index.at_least("ram_gb", 12))
+        return np.ones(total, dtype=bool)
+
+    return mask
+
+
 def filter_by_usage(df: pd.DataFrame, usage_key: str, preferences: Dict[str, Any]) -> pd.DataFrame:
     """Kullanım amacına göre ön filtreleme uygular."""
-    filtered = df.copy()
+    index = BitmapIndex(df)
+    return index.select(usage_mask(index, usage_key, preferences))
 
-    if usage_key == "gaming":
-        min_needed = float(preferences.get("min_gpu_score_required", 6.0))
-        if "gpu_score" in filtered.columns:
-            filtered = filtered[filtered["gpu_score"] >= min_needed]
-        if "ram_gb" in filtered.columns:
-            filtered = filtered[filtered["ram_gb"] >= 8]
 
-    elif usage_key == "portability":
-        if "screen_size" in filtered.columns:
-            filtered = filtered[filtered["screen_size"] <= 14.5]
-        if len(filtered) > 50 and "gpu_score" in filtered.columns:
-            filtered = filtered[filtered["gpu_score"] <= 5.0]
-        elif len(filtered) > 30 and "gpu_score" in filtered.columns:
-            filtered = filtered[filtered["gpu_score"] <= 6.0]
+def build_filter_index(df: pd.DataFrame) -> BitmapIndex:
+    """
+    Kenar çubuğu filtreleri ve kullanım amacı ön filtreleri için vektörleri önceden
+    hesaplanmış BitmapIndex; hazır katalog için bir kez kurulup sorgular arasında paylaşılır.
+    """
+    index = BitmapIndex(df).precompute()
+    for usage_key in USAGE_FILTER_KEYS:
+        _preset_mask(index, usage_key, {})
+    for dev_mode in DEV_PRESETS:
+        _preset_mask(index, "dev", {"dev_mode": dev_mode})
+    return index
 
-    elif usage_key == "productivity":
-        if "ram_gb" in filtered.columns:
-            filtered = filtered[filtered["ram_gb"] >= 8]
-        if "cpu_score" in filtered.columns:
-            filtered = filtered[filtered["cpu_score"] >= 5.0]
 
-    elif usage_key == "design":
-        if "ram_gb" in filtered.columns:
-            filtered = filtered[filtered["ram_gb"] >= 16]
-        if "gpu_score" in filtered.columns:
-            filtered = filtered[filtered["gpu_score"] >= 4.0]
-        if "screen_size" in filtered.columns:
-            filtered = filtered[filtered["screen_size"] >= 14.0]
+def _ranked(score: np.ndarray, price: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Adayları skor azalan, fiyat artan sırada döndürür; eşitlikte ilk sıra korunur."""
+    order = np.lexsort((price[candidates], -score[candidates]))
+    return candidates[order]
 
-    elif usage_key == "dev":
-        if "ram_gb" in filtered.columns:
-            filtered = filtered[filtered["ram_gb"] >= 16]
-        if "cpu_score" in filtered.columns:
-            filtered = filtered[filtered["cpu_score"] >= 6.0]
-        if "ssd_gb" in filtered.columns:
-            filtered = filtered[filtered["ssd_gb"] >= 256]
 
-        dev_mode = preferences.get("dev_mode", "general")
-        preset = DEV_PRESETS.get(dev_mode, DEV_PRESETS["general"])
-        if "ram_gb" in filtered.columns:
-            filtered = filtered[filtered["ram_gb"] >= preset["min_ram"]]
-        if "ssd_gb" in filtered.columns:
-            filtered = filtered[filtered["ssd_gb"] >= preset["min_ssd"]]
-        if "screen_size" in filtered.columns:
-            filtered = filtered[filtered["screen_size"] <= preset["screen_max"]]
-
-        if preset.get("need_dgpu") or preset.get("need_cuda"):
-            if "gpu_norm" in filtered.columns:
-                filtered = filtered[filtered["gpu_norm"].apply(_has_dgpu)]
-                if preset.get("need_cuda"):
-                    filtered = filtered[filtered["gpu_norm"].apply(_is_nvidia_cuda)]
-
-    if len(filtered) < 5 and len(df) > 5:
-        if usage_key == "gaming" and "gpu_score" in df.columns:
-            return df[df["gpu_score"] >= 5.0]
-        if usage_key == "portability" and "screen_size" in df.columns:
-            return df[df["screen_size"] <= 15.6]
-        if usage_key in ["design", "dev"] and "ram_gb" in df.columns:
-            return df[df["ram_gb"] >= 12]
-        return df
-
-    return filtered
+def select_top_positions(score: np.ndarray, price: np.ndarray, brand_codes: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Skor/fiyat sırasına göre ilk top_n satırın konumlarını döndürür.
+    İlk iki öneri doğrudan alınır; üçüncü öneri ilk ikisinden farklı markadan olmalıdır,
+    arada atlanan satırlar sonradan geri alınmaz. Sadece en iyi adaylar sıralanır;
+    uygun üçüncü aday bulunamazsa aday sayısı ikiye katlanarak genişletilir.
+    """
+    total = len(score)
+    # top_n < 1 olsa da en az bir öneri döner (eski satır döngüsüyle aynı).
+    top_n = max(1, top_n)
+    width = min(total, top_n + len(np.unique(brand_codes)))
+    while width > 0:
+        if width < total:
+            threshold = np.partition(-score, width - 1)[width - 1]
+            ranked = _ranked(score, price, np.flatnonzero(-score <= threshold))
+        else:
+            ranked = _ranked(score, price, np.arange(total))
+        complete = len(ranked) >= total
+
+        if top_n <= 2 or len(ranked) <= 2:
+            return ranked[:top_n]
+        codes = brand_codes[ranked]
+        fresh = np.flatnonzero((codes[2:] != codes[0]) & (codes[2:] != codes[1]))
+        if len(fresh):
+            third = 2 + fresh[0]
+            if third + top_n - 3 < len(ranked) or complete:
+                return np.concatenate([ranked[:2], ranked[third:third + top_n - 2]])
+        elif complete:
+            return ranked[:2]
+        width = min(total, width * 2)
+    return np.arange(0)
 
 
 def get_recommendations(
-    df: pd.DataFrame, preferences: Dict[str, Any], top_n: int = 5
+    df: pd.DataFrame,
+    preferences: Dict[str, Any],
+    top_n: int = 5,
+    index: BitmapIndex | None = None,
+    mask: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     Bütçe ve kullanım amacına göre skorlayıp sıralanmış öneriler döndürür.
     Çıktı DataFrame'ine skor ve breakdown ekler, attrs ile meta taşır.
+
+    index verilirse (build_filter_index(df)) ön filtre vektörleri oradan okunur; mask ile
+    df satırları önceden daraltılabilir (ör. kenar çubuğu filtreleri). Bütçe aralığı fiyat
+    sıralı permütasyonda iki ikili aramayla bulunur; diğer filtreler yalnızca bu dilimdeki
+    konumlar üzerinde uygulanır ve satırlar bir kez seçilir.
     """
     usage_key = preferences.get("usage_key", "productivity")
     usage_label = preferences.get("usage_label", "")
 
+    if index is None:
+        index = BitmapIndex(df)
+    elif len(index) != len(df):
+        raise ValueError("BitmapIndex bu DataFrame için kurulmamış (satır sayısı farklı).")
+
     min_budget = float(preferences.get("min_budget", 0))
     max_budget = float(preferences.get("max_budget", np.inf))
-    budget_filtered = df[(df["price"] >= min_budget) & (df["price"] <= max_budget)].copy()
+    rows = index.between("price", min_budget, max_budget)
+    if mask is not None:
+        rows = rows[mask[rows]]
 
-    if budget_filtered.empty:
+    if len(rows) == 0:
         return pd.DataFrame()
 
-    filtered = filter_by_usage(budget_filtered, usage_key, preferences)
+    # Katalog sırasına dönülür: tekrar elemede "ilk kayıt" ve eşit skorlarda sıra değişmez.
+    rows = np.sort(rows)
+    rows = rows[usage_mask(index, usage_key, preferences, rows)]
 
-    if usage_key == "gaming" and not filtered.empty:
+    if usage_key == "gaming" and len(rows):
         min_gpu = float(preferences.get("gaming_min_gpu", preferences.get("min_gpu_score_required", 6.0)))
-        if "gpu_score" in filtered.columns:
-            filtered = filtered[filtered["gpu_score"] >= min_gpu]
-        if filtered.empty:
+        if index.has("gpu_score"):
+            rows = rows[index.at_least("gpu_score", min_gpu)[rows]]
+        if len(rows) == 0:
             return pd.DataFrame()
 
+    filtered = index.take(rows)
+
     if "url" in filtered.columns:
         filtered = filtered.drop_duplicates(subset=["url"], keep="first")
     filtered = filtered.drop_duplicates(subset=["name", "price"], keep="first")
+    # Aynı ürün birden fazla mağazada listeleniyorsa yalnızca en ucuz teklif kalır.
+    filtered = cheapest_offers(filtered)
 
     if filtered.empty:
         return pd.DataFrame()
 
-    scores: List[float] = []
-    breakdowns: List[str] = []
-    for _, row in filtered.iterrows():
-        score, breakdown = calculate_score(row, preferences)
-        scores.append(score)
-        breakdowns.append(breakdown)
-    filtered["score"] = scores
-    filtered["score_breakdown"] = breakdowns
-
-    filtered = filtered.sort_values(by=["score", "price"], ascending=[False, True])
-
-    recommendations: List[pd.Series] = []
-    seen_brands: set[str] = set()
-    for _, row in filtered.iterrows():
-        brand = row.get("brand")
-        if len(recommendations) < 3:
-            if brand not in seen_brands or len(recommendations) < 2:
-                recommendations.append(row)
-                seen_brands.add(brand)
-        else:
-            recommendations.append(row)
-        if len(recommendations) >= top_n:
-            break
+    filtered["score"] = score_array(filtered, preferences)
 
-    result_df = pd.DataFrame(recommendations)
+    if "brand" in filtered.columns:
+        brand_codes = pd.factorize(filtered["brand"])[0]
+    else:
+        brand_codes = np.zeros(len(filtered), dtype=np.intp)
+    positions = select_top_positions(
+        filtered["score"].to_numpy(dtype=np.float64),
+        filtered["price"].to_numpy(dtype=np.float64, na_value=np.nan),
+        brand_codes,
+        top_n,
+    )
+
+    result_df = filtered.iloc[positions]
     if not result_df.empty:
+        # Seçilen satırların skoru calculate_score sırasıyla yeniden toplanır; açıklama
+        # metni de yalnızca bu satırlar için üretilir.
+        parts = score_frame(result_df, preferences)
+        result_df["score"] = parts["score"]
+        result_df["score_breakdown"] = format_breakdown(parts)
         result_df.attrs["usage_label"] = usage_label
         result_df.attrs["avg_score"] = result_df["score"].mean()
         result_df.attrs["price_range"] = (result_df["price"].min(), result_df["price"].max())
 
-    return result_df
+    return result_df
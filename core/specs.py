@@ -0,0 +1,510 @@
+"""
+Spec normalization shared by clean_data and the store scrapers.
+
+Two families of parsers live here, all built on regexes compiled at import:
+
+- Field parsers (clean_price, clean_ram_value, clean_ssd_value,
+  parse_screen_size, detect_os) read a value that is already known to be a
+  price/RAM/SSD/screen/OS field. clean_data applies them; each has a
+  vectorized *_series counterpart with identical results.
+- Text extractors (ram_gb_from_text, ssd_gb_from_text,
+  screen_inches_from_text, os_label_from_text) pull a spec out of a
+  free-text title or spec blob, skipping GPU VRAM, storage sizes next to RAM
+  and "13. Nesil" style generation numbers. The scrapers use them, so every
+  store parses the same product the same way; each returns the given default
+  when nothing matches, and each has a *_series form that parses every
+  distinct text once.
+"""
+from typing import List, Optional, Tuple
+import re
+import numpy as np
+import pandas as pd
+
+from core.distinct import factorize_by_type, get_distinct_cache, map_distinct
+
+_RAM_SIZES = [4, 8, 12, 16, 24, 32, 48, 64, 128]
+_SSD_SIZES = [128, 256, 512, 1024, 2048]
+# A digit that is not ASCII: int() accepts it but pd.to_numeric does not, so
+# such values are handed to the scalar parser.
+_NON_ASCII_DIGIT = r"(?![0-9])\d"
+
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+_NUMBER_RE = re.compile(r"(\d+)")
+_GB_RE = re.compile(r"(\d+)\s*GB")
+_TB_RE = re.compile(r"(\d+)\s*TB")
+_RAM_PARENS_RE = re.compile(r"\((\d+)\s*GB\)")
+_SCREEN_JOIN_RE = re.compile(r"(\d{2})\s*\.\s*(\d)")
+_SCREEN_NUMBER_RE = re.compile(r"(\d{2}(?:\.\d)?)")
+
+# Text extractor patterns; they run on lowered text.
+_VRAM_RE = re.compile(
+    r"(?:rtx|gtx|rx|arc|mx)[\w\s\-]*?\b\d+\s*gb"
+    r"|gddr\d?\s*\d+\s*gb"
+    r"|\b\d+\s*gb\s*vram\b"
+)
+_RAM_LABELLED_RE = re.compile(r"(\d+)\s*gb\s*(?:ram|ddr|lpddr|sdram|bellek|memory)")
+_GB_TEXT_RE = re.compile(r"(\d+)\s*gb")
+_TB_TEXT_RE = re.compile(r"(?<!\d)(\d+)\s*tb")
+_STORAGE_WORDS = r"(?:ssd|emmc|ufs|nvme|m\.2|pcie|hdd|storage|depolama)"
+_STORAGE_AFTER_RE = re.compile(r"\s*" + _STORAGE_WORDS)
+_STORAGE_BEFORE_RE = re.compile(_STORAGE_WORDS + r"\s*$")
+_SSD_LABELLED_RE = re.compile(r"(\d+)\s*gb\s*" + _STORAGE_WORDS + r"|ssd\s*(\d+)\s*gb")
+_SCREEN_UNIT_RE = re.compile(r"(?<![\d.])(\d{2}(?:\.\d{1,2})?)\s*(?:\"|''|”|″|inç|inch|inc\b)")
+_SCREEN_DECIMAL_RE = re.compile(r"(?<![\d.])(\d{2}\.\d)(?!\d)")
+_GENERATION_RE = re.compile(r"nesil|gen")
+
+_SSD_ALIASES = {1000: 1024, 500: 512, 2000: 2048}
+_SSD_TEXT_SIZES = [128, 256, 512, 1024, 2048, 4096, 8192]
+
+
+def clean_price(price_str):
+    """Normalize price text to an integer value; return None when invalid."""
+    if pd.isna(price_str):
+        return None
+
+    if isinstance(price_str, (int, float)):
+        price = int(price_str)
+    else:
+        cleaned = _NON_DIGIT_RE.sub("", str(price_str))
+        if not cleaned:
+            return None
+        try:
+            price = int(cleaned)
+        except ValueError:
+            return None
+
+    if price < 1000 or price > 500_000:
+        return None
+    return price
+
+
+def clean_ram_value(ram_str):
+    """Extract RAM size in GB; default to 8 when it cannot be parsed."""
+    if pd.isna(ram_str):
+        return 8
+
+    ram_text = str(ram_str).upper()
+    match = _RAM_PARENS_RE.search(ram_text)
+    if match:
+        return int(match.group(1))
+
+    numbers = _GB_RE.findall(ram_text)
+    if numbers:
+        return max(int(n) for n in numbers)
+
+    numbers = _NUMBER_RE.findall(ram_text)
+    if numbers:
+        value = int(numbers[0])
+        if value in _RAM_SIZES:
+            return value
+
+    return 8
+
+
+def clean_ssd_value(storage_str):
+    """Extract SSD size in GB; default to 256 when it cannot be parsed."""
+    if pd.isna(storage_str):
+        return 256
+
+    storage_text = str(storage_str).upper()
+    tb_match = _TB_RE.search(storage_text)
+    if tb_match:
+        return int(tb_match.group(1)) * 1024
+
+    gb_match = _GB_RE.search(storage_text)
+    if gb_match:
+        gb_val = int(gb_match.group(1))
+        if gb_val in _SSD_SIZES:
+            return gb_val
+        if gb_val == 1000:
+            return 1024
+        if gb_val == 500:
+            return 512
+
+    numbers = _NUMBER_RE.findall(storage_text)
+    if numbers:
+        value = int(numbers[0])
+        if value in _SSD_SIZES:
+            return value
+        if value == 1:
+            return 1024
+
+    return 256
+
+
+def parse_screen_size(val) -> float:
+    """
+    Parse screen size text into inches.
+
+    Values outside the 10-19.9 interval are rejected and np.nan is returned.
+    """
+    if pd.isna(val):
+        return np.nan
+
+    text = str(val).lower()
+    text = text.replace(",", ".")
+    text = _SCREEN_JOIN_RE.sub(r"\1.\2", text)
+
+    for match in _SCREEN_NUMBER_RE.finditer(text):
+        try:
+            size = float(match.group(1))
+            if 10.0 <= size <= 19.9:
+                return size
+        except ValueError:
+            continue
+
+    return np.nan
+
+
+def _first_number(text: pd.Series, pattern: str) -> np.ndarray:
+    """Numeric value of the first capture of pattern per row; NaN without a match."""
+    return pd.to_numeric(text.str.extract(pattern, expand=False), errors="coerce").to_numpy(dtype=float)
+
+
+def _parse_distinct(series: pd.Series, parse_uniques, scalar_func, default, by_text: bool = True) -> pd.Series:
+    """
+    Run a vectorized parser once per distinct value and broadcast the results.
+
+    parse_uniques receives the distinct values (as str when by_text, since the
+    scalar parsers work on str(value)) and returns one result per value.
+    Missing values get default; values containing non-ASCII digits are parsed
+    with scalar_func so results stay identical to it. Parsed values are kept in
+    the distinct-value cache, so only values not seen before are parsed.
+    """
+    keys = series.astype(str).where(series.notna()) if by_text else series
+    codes, uniques = factorize_by_type(keys)
+
+    def parse_missing(values: List) -> np.ndarray:
+        missing = pd.Series(values) if by_text else pd.Series(values, dtype=object)
+        parsed = np.asarray(parse_uniques(missing), dtype=float)
+        odd = missing.astype(str).str.contains(_NON_ASCII_DIGIT, regex=True).to_numpy(dtype=bool)
+        for position in np.flatnonzero(odd):
+            value = scalar_func(missing.iloc[position])
+            parsed[position] = np.nan if value is None else value
+        return parsed
+
+    cache = get_distinct_cache(f"{scalar_func.__name__}:vectorized")
+    parsed = np.asarray(cache.get_many(uniques, parse_missing), dtype=float)
+    values = np.append(parsed, default)[codes]
+    return pd.Series(values, index=series.index)
+
+
+def _price_of_uniques(uniques: pd.Series) -> np.ndarray:
+    """clean_price for an object Series of distinct non-null values."""
+    values = np.full(len(uniques), np.nan)
+    numeric = uniques.map(lambda v: isinstance(v, (int, float))).to_numpy(dtype=bool)
+    if numeric.any():
+        values[numeric] = np.trunc(uniques[numeric].astype("float64").to_numpy())
+    if (~numeric).any():
+        digits = uniques[~numeric].astype(str).str.replace(_NON_DIGIT_RE.pattern, "", regex=True)
+        values[~numeric] = pd.to_numeric(digits.replace("", np.nan), errors="coerce").to_numpy()
+    values[(values < 1000) | (values > 500_000)] = np.nan
+    return values
+
+
+def _ram_of_uniques(uniques: pd.Series) -> np.ndarray:
+    """clean_ram_value for a Series of distinct str values."""
+    text = uniques.str.upper()
+    in_parens = _first_number(text, _RAM_PARENS_RE.pattern)
+    gb_all = pd.to_numeric(text.str.extractall(_GB_RE.pattern)[0], errors="coerce")
+    gb_max = gb_all.groupby(level=0).max().reindex(text.index).to_numpy(dtype=float)
+    first = _first_number(text, _NUMBER_RE.pattern)
+    return np.select(
+        [~np.isnan(in_parens), ~np.isnan(gb_max), np.isin(first, _RAM_SIZES)],
+        [in_parens, gb_max, first],
+        default=8,
+    )
+
+
+def _ssd_of_uniques(uniques: pd.Series) -> np.ndarray:
+    """clean_ssd_value for a Series of distinct str values."""
+    text = uniques.str.upper()
+    tb = _first_number(text, _TB_RE.pattern)
+    gb = _first_number(text, _GB_RE.pattern)
+    first = _first_number(text, _NUMBER_RE.pattern)
+    return np.select(
+        [
+            ~np.isnan(tb),
+            np.isin(gb, _SSD_SIZES),
+            gb == 1000,
+            gb == 500,
+            np.isin(first, _SSD_SIZES),
+            first == 1,
+        ],
+        [tb * 1024, gb, 1024, 512, first, 1024],
+        default=256,
+    )
+
+
+def clean_price_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized clean_price over a Series, with identical results.
+
+    Values outside 1000-500000 become NaN; the dtype stays int64 when none do.
+    """
+    if series.dtype.kind in "biuf":
+        values = np.trunc(series.to_numpy(dtype=float))
+        values[(values < 1000) | (values > 500_000)] = np.nan
+        result = pd.Series(values, index=series.index)
+    else:
+        result = _parse_distinct(series, _price_of_uniques, clean_price, np.nan, by_text=False)
+    if result.notna().all():
+        result = result.astype("int64")
+    return result
+
+
+def clean_ram_series(series: pd.Series) -> pd.Series:
+    """Vectorized clean_ram_value over a Series, with identical results."""
+    return _parse_distinct(series, _ram_of_uniques, clean_ram_value, 8).astype("int64")
+
+
+def clean_ssd_series(series: pd.Series) -> pd.Series:
+    """Vectorized clean_ssd_value over a Series, with identical results."""
+    return _parse_distinct(series, _ssd_of_uniques, clean_ssd_value, 256).astype("int64")
+
+
+def parse_screen_size_series(series: pd.Series) -> pd.Series:
+    """parse_screen_size over a Series, parsing each distinct value once."""
+    return map_distinct(series, parse_screen_size)
+
+
+def ram_gb_from_text(text, default: Optional[int] = None) -> Optional[int]:
+    """
+    RAM size in GB mentioned in a title or spec text.
+
+    An explicit "16 GB RAM/DDR" wins; otherwise the largest 4-192 GB figure
+    that is neither GPU memory nor next to a storage word is used.
+    """
+    if text is None or pd.isna(text):
+        return default
+
+    lowered = _VRAM_RE.sub(" ", str(text).lower())
+    match = _RAM_LABELLED_RE.search(lowered)
+    if match and 4 <= int(match.group(1)) <= 192:
+        return int(match.group(1))
+
+    candidates = []
+    for match in _GB_TEXT_RE.finditer(lowered):
+        value = int(match.group(1))
+        if not 4 <= value <= 192:
+            continue
+        start, end = match.span()
+        if _STORAGE_AFTER_RE.match(lowered, end):
+            continue
+        if _STORAGE_BEFORE_RE.search(lowered[max(0, start - 10):start]):
+            continue
+        candidates.append(value)
+
+    return max(candidates) if candidates else default
+
+
+def _ssd_size(value: int) -> Optional[int]:
+    """Map a GB figure to a marketed SSD size (1000 -> 1024, 500 -> 512); None if implausible."""
+    value = _SSD_ALIASES.get(value, value)
+    return value if value in _SSD_TEXT_SIZES else None
+
+
+def ssd_gb_from_text(text, default: Optional[int] = None) -> Optional[int]:
+    """
+    SSD size in GB mentioned in a title or spec text.
+
+    TB figures win, then GB figures labelled as storage ("512GB SSD",
+    "SSD 1 TB"), then any marketed SSD size (128 GB and up).
+    """
+    if text is None or pd.isna(text):
+        return default
+
+    lowered = str(text).lower()
+    match = _TB_TEXT_RE.search(lowered)
+    if match and 1 <= int(match.group(1)) <= 8:
+        return int(match.group(1)) * 1024
+
+    for match in _SSD_LABELLED_RE.finditer(lowered):
+        size = _ssd_size(int(match.group(1) or match.group(2)))
+        if size is not None:
+            return size
+
+    for match in _GB_TEXT_RE.finditer(lowered):
+        size = _ssd_size(int(match.group(1)))
+        if size is not None:
+            return size
+
+    return default
+
+
+def screen_inches_from_text(text, default: Optional[float] = None) -> Optional[float]:
+    """
+    Screen diagonal in inches mentioned in a title or spec text.
+
+    A number with a unit (15.6", 16 inç) wins; otherwise the first decimal
+    such as 15.6 that does not follow "nesil"/"gen". Only 10-19.9 is accepted.
+    """
+    if text is None or pd.isna(text):
+        return default
+
+    lowered = str(text).lower().replace(",", ".")
+    for match in _SCREEN_UNIT_RE.finditer(lowered):
+        size = float(match.group(1))
+        if 10.0 <= size <= 19.9:
+            return size
+
+    for match in _SCREEN_DECIMAL_RE.finditer(lowered):
+        if _GENERATION_RE.search(lowered[max(0, match.start() - 10):match.start()]):
+            continue
+        size = float(match.group(1))
+        if 10.0 <= size <= 19.9:
+            return size
+
+    return default
+
+
+# Text OS rules in precedence order: explicit OS names first (same order as
+# OS_FIELD_RULES), then device hints for titles that name no OS.
+_OS_TEXT_RULES: List[Tuple[str, "re.Pattern[str]"]] = [
+    ("Windows 11", re.compile(r"windows\s?11|\bwin\s?11|\bw11(?:p|pro)?\b")),
+    ("Windows 10", re.compile(r"windows\s?10|\bwin\s?10|\bw10(?:p|pro)?\b")),
+    ("Windows", re.compile(r"windows(?!\s*hello)")),
+    ("macOS", re.compile(r"mac\s?os|\bos\s?x\b|sonoma|ventura|monterey|sequoia")),
+    ("ChromeOS", re.compile(r"chrome\s?os|chromebook")),
+    ("Linux", re.compile(r"ubuntu|linux|debian")),
+    ("FreeDOS", re.compile(r"free\s?dos|\bf?dos\b")),
+    ("macOS", re.compile(r"macbook|\bimac\b|\bapple\b")),
+]
+
+
+def os_label_from_text(text, default: Optional[str] = None) -> Optional[str]:
+    """
+    Operating system named in a title or spec text, as a display label
+    ("Windows 11", "Windows 10", "Windows", "macOS", "ChromeOS", "Linux",
+    "FreeDOS"). Apple devices without an OS mention count as macOS.
+    """
+    if text is None or pd.isna(text):
+        return default
+
+    lowered = str(text).lower()
+    for label, pattern in _OS_TEXT_RULES:
+        if pattern.search(lowered):
+            return label
+    return default
+
+
+def _from_text_series(series: pd.Series, extractor, default) -> pd.Series:
+    """extractor(text, default) per row, evaluated once per distinct text."""
+    return map_distinct(
+        series,
+        lambda text: extractor(text, default),
+        name=f"specs.{extractor.__name__}:{default!r}",
+    )
+
+
+def ram_gb_from_text_series(series: pd.Series, default: Optional[int] = None) -> pd.Series:
+    """Vectorized ram_gb_from_text over a Series of texts."""
+    return _from_text_series(series, ram_gb_from_text, default)
+
+
+def ssd_gb_from_text_series(series: pd.Series, default: Optional[int] = None) -> pd.Series:
+    """Vectorized ssd_gb_from_text over a Series of texts."""
+    return _from_text_series(series, ssd_gb_from_text, default)
+
+
+def screen_inches_from_text_series(series: pd.Series, default: Optional[float] = None) -> pd.Series:
+    """Vectorized screen_inches_from_text over a Series of texts."""
+    return _from_text_series(series, screen_inches_from_text, default)
+
+
+def os_label_from_text_series(series: pd.Series, default: Optional[str] = None) -> pd.Series:
+    """Vectorized os_label_from_text over a Series of texts."""
+    return _from_text_series(series, os_label_from_text, default)
+
+
+# OS keyword rules in precedence order: the explicit os column first, then
+# the product name, then the brand fallback (see detect_os).
+OS_FIELD_RULES: List[Tuple[str, List[str]]] = [
+    ("windows", ["windows", "win11", "win10", "w11", "w10"]),
+    ("macos", ["mac", "macos", "os x"]),
+    ("linux", ["ubuntu", "linux", "debian"]),
+    ("freedos", ["dos", "free", "yok", "none"]),
+]
+OS_NAME_RULES: List[Tuple[str, List[str]]] = [
+    ("windows", ["windows 11", "win11", "w11", "windows 10", "win10"]),
+    ("macos", ["macbook", "mac "]),
+    ("freedos", ["freedos", "free dos", "fdos", "dos", "/dos"]),
+]
+
+
+def detect_os(row: pd.Series) -> str:
+    """Infer OS from explicit column, product name, or brand."""
+    os_field = row.get("os", None)
+    if pd.notna(os_field):
+        os_text = str(os_field).lower()
+        for os_name, keywords in OS_FIELD_RULES:
+            if any(x in os_text for x in keywords):
+                return os_name
+
+    name_text = str(row.get("name", "")).lower()
+    for os_name, keywords in OS_NAME_RULES:
+        if any(x in name_text for x in keywords):
+            return os_name
+
+    if row.get("brand") == "apple":
+        return "macos"
+    return "freedos"
+
+
+def _lower_text(series: pd.Series) -> pd.Series:
+    """
+    str(value).lower() per row, using Python's lower().
+
+    Arrow-backed .str.lower() folds Turkish "İ" to "i" while Python keeps the
+    combining dot, so lowering happens on object values to match detect_os.
+    """
+    lowered = series.astype(object).map(str, na_action="ignore").str.lower()
+    return lowered.fillna("nan").astype(str)
+
+
+def _contains_any(text: pd.Series, keywords: List[str]) -> np.ndarray:
+    """Boolean mask of rows containing at least one keyword as a substring."""
+    mask = np.zeros(len(text), dtype=bool)
+    for keyword in keywords:
+        mask |= text.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+    return mask
+
+
+def detect_os_series(df: pd.DataFrame, explain: bool = False):
+    """
+    Vectorized detect_os over a frame with the same rule precedence.
+
+    Returns the OS Series, or (os, rule) when explain is True; rule reads like
+    "os:windows", "name:freedos", "brand:apple" or "default".
+    """
+    conditions: List[np.ndarray] = []
+    labels: List[str] = []
+    rules: List[str] = []
+
+    if "os" in df.columns:
+        has_os = df["os"].notna().to_numpy()
+        os_text = _lower_text(df["os"])
+        for os_name, keywords in OS_FIELD_RULES:
+            conditions.append(has_os & _contains_any(os_text, keywords))
+            labels.append(os_name)
+            rules.append(f"os:{os_name}")
+
+    if "name" in df.columns:
+        name_text = _lower_text(df["name"])
+    else:
+        name_text = pd.Series("", index=df.index)
+    for os_name, keywords in OS_NAME_RULES:
+        conditions.append(_contains_any(name_text, keywords))
+        labels.append(os_name)
+        rules.append(f"name:{os_name}")
+
+    if "brand" in df.columns:
+        conditions.append((df["brand"] == "apple").to_numpy(dtype=bool))
+        labels.append("macos")
+        rules.append("brand:apple")
+
+    os_values = pd.Series(np.select(conditions, labels, default="freedos"), index=df.index)
+    if not explain:
+        return os_values
+    os_rules = pd.Series(np.select(conditions, rules, default="default"), index=df.index)
+    return os_values, os_rules
@@ -4,6 +4,12 @@ import requests
 import pandas as pd
 from bs4 import BeautifulSoup
 
+# core paketini script olarak çalıştırırken de bulabilmek için proje kökü
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+from core import specs
+
 # Playwright yalnız captcha/0 ürün olduğunda devreye girecek
 PLAYWRIGHT_AVAILABLE = True
 try:
@@ -65,69 +71,26 @@ def _price_to_int_tl(x):
 
 def _ram_to_gb(x):
     if x is None: return 8
-    s = str(x).upper()
-    # 8GB, 16 GB, 8+8GB, (16 GB) gibi
-    nums = [int(n) for n in __import__('re').findall(r'(\d+)\s*GB', s)]
-    if nums: return max(nums)
-    # sadece sayı varsa
-    nums = __import__('re').findall(r'\d+', s)
-    if nums:
-        n = int(nums[0])
-        if n in [4, 8, 12, 16, 24, 32, 48, 64, 128]:
-            return n
-    return 8
+    return specs.clean_ram_value(x)
 
 
 def _ssd_to_gb(x):
     if x is None: return 256
-    s = str(x).upper()
-    m = __import__('re').search(r'(\d+)\s*TB', s)
-    if m:
-        return int(m.group(1)) * 1024
-    m = __import__('re').search(r'(\d+)\s*GB', s)
-    if m:
-        g = int(m.group(1))
-        if g == 1000: return 1024
-        if g == 500:  return 512
-        return g
-    # sadece sayı
-    m = __import__('re').search(r'(\d+)', s)
-    if m:
-        v = int(m.group(1))
-        if v == 1: return 1024
-        if v in [128, 256, 512, 1024, 2048]:
-            return v
-    return 256
+    return specs.clean_ssd_value(x)
 
 
 def _screen_to_float(val):
     if val is None: return 15.6
-    s = str(val).lower().replace(',', '.')
-    s = __import__('re').sub(r'(\d{2})\s*\.\s*(\d)', r'\1.\2', s)  # "16 . 1" -> "16.1"
-    for m in __import__('re').finditer(r'(\d{2}(?:\.\d)?)', s):
-        try:
-            x = float(m.group(1))
-            if 10.0 <= x <= 19.9:
-                return x
-        except:
-            pass
-    return 15.6
+    size = specs.parse_screen_size(val)
+    return 15.6 if pd.isna(size) else size
 
 
 def _normalize_os(name, os_field, brand_guess=None):
-    s_list = []
-    if os_field: s_list.append(str(os_field).lower())
-    if name:     s_list.append(str(name).lower())
-    s = " ".join(s_list)
-    if any(k in s for k in ['windows 11', 'win11', 'w11', 'windows 10', 'win10', 'w10', 'windows']):
-        return 'windows'
-    if any(k in s for k in ['macbook', 'mac ', 'macos', 'os x']) or (brand_guess == 'apple'):
-        return 'macos'
-    if any(k in s for k in ['ubuntu', 'linux', 'debian']):
-        return 'linux'
-    if any(k in s for k in ['freedos', 'free dos', 'fdos', ' dos ']):
-        return 'freedos'
-    return 'freedos'
+    """OS etiketi: önce OS alanı, sonra ürün adı; Apple cihazlar macOS, hiçbiri yoksa FreeDOS."""
+    label = specs.os_label_from_text(os_field) or specs.os_label_from_text(name)
+    if label is None and brand_guess == 'apple':
+        label = 'macOS'
+    return label or 'FreeDOS'
 
 
 def _brand_from_name(name):
@@ -151,15 +114,6 @@ def _brand_from_name(name):
         if any(k in nl for k in keys):
             return b
     return 'other'
-def _normalize_os_compat(name, os_field, brand_guess=None):
-    """_normalize_os tek argümanlı veya 3 argümanlı olsun, ikisine de uyum sağla."""
-    try:
-        # 3 argümanlı sürüm varsa bunu çalıştırır
-        return _normalize_os(name, os_field, brand_guess)
-    except TypeError:
-        # Tek argümanlı (sadece os_field alan) sürüm varsa buraya düşer
-        return _normalize_os(os_field)
-
 def _normalize_gpu(val):
     if val is None:
         return "integrated"
@@ -194,24 +148,6 @@ def _normalize_cpu(val):
     return s.replace("CORE ", "")
 
 
-def _normalize_os(val):
-    if val is None:
-        return "FreeDOS"
-    s = str(val).lower()
-    if "windows 11" in s or "win11" in s or "w11" in s:
-        return "Windows 11"
-    if "windows 10" in s or "win10" in s or "w10" in s:
-        return "Windows 10"
-    if "mac" in s:
-        return "macOS"
-    if "linux" in s or "ubuntu" in s or "debian" in s:
-        return "Linux"
-    if "chrome" in s:
-        return "ChromeOS"
-    if "free" in s or "dos" in s:
-        return "FreeDOS"
-    return "FreeDOS"
-
 # === END: main_recommender uyumluluk yardımcıları ===
 
 class AmazonLaptopScraper:
@@ -314,25 +250,10 @@ class AmazonLaptopScraper:
 
         tl = title.lower()
 
-        # Ekran - Enhanced patterns
-        screen_patterns = [
-            r'(\d+[\.,]?\d*)\s*(?:inç|inch|")',
-            r'(\d+[\.,]?\d*)\s*ekran',
-            r'(\d+[\.,]?\d*)["\']',
-            r'(\d+[\.,]?\d*)\s*fhd',
-            r'(\d+[\.,]?\d*)\s*hd'
-        ]
-        for pat in screen_patterns:
-            m = re.search(pat, title, re.IGNORECASE)
-            if m:
-                size = m.group(1).replace(",", ".")
-                try:
-                    size_float = float(size)
-                    if 10.0 <= size_float <= 20.0:
-                        info['screen_size'] = f'{size}"'
-                        break
-                except:
-                    pass
+        # Ekran - core.specs ortak ayrıştırıcısı
+        screen = specs.screen_inches_from_text(title)
+        if screen is not None:
+            info['screen_size'] = f'{screen}"'
 
         # If no screen size found, guess based on product type
         if not info['screen_size']:
@@ -343,24 +264,9 @@ class AmazonLaptopScraper:
             else:
                 info['screen_size'] = '15.6"'  # Most common default
 
-        # SSD - Enhanced with more patterns
-        ssd_patterns = [
-            r'(\d+)\s*(gb|tb)\s*(ssd|m\.2|nvme|pcie)',
-            r'(\d+)\s*(gb|tb)\s*ssd',
-            r'ssd\s*(\d+)\s*(gb|tb)',
-            r'(\d+)(gb|tb)ssd',
-            r'(\d+)\s*(gb|tb)\s*(?:depolama|storage)',
-            r'(\d+)\s*(?:gb|tb)'  # Fallback - any GB/TB mention
-        ]
-        for pat in ssd_patterns:
-            m = re.search(pat, title, re.IGNORECASE)
-            if m:
-                size, unit = m.group(1), (m.group(2).upper() if len(m.groups()) > 1 else 'GB')
-                info['ssd'] = f"{size}{unit}"
-                break
-
-        if not info['ssd']:
-            info['ssd'] = '512GB'  # Common default
+        # SSD - core.specs ortak ayrıştırıcısı
+        ssd_gb = specs.ssd_gb_from_text(title)
+        info['ssd'] = f"{ssd_gb}GB" if ssd_gb else '512GB'  # Common default
 
         # CPU - Enhanced detection with full model names where possible
         cpu_patterns = [
@@ -408,24 +314,10 @@ class AmazonLaptopScraper:
             else:
                 info['cpu'] = 'i5'  # Most common default
 
-        # RAM - Enhanced extraction
-        ram_patterns = [
-            r'(\d+)\s*gb\s*(?:ram|ddr|sdram|bellek|memory)',
-            r'(\d+)gb\s*ram',
-            r'ram\s*(\d+)\s*gb',
-            r'(\d+)\s*gb.*bellek',
-            r'bellek.*(\d+)\s*gb',
-            r'(\d+)\s*gb\s*ddr\d',
-            r'(\d+)\s*gb'  # Fallback - any GB mention that's not SSD
-        ]
-        for pat in ram_patterns:
-            m = re.search(pat, title, re.IGNORECASE)
-            if m:
-                ram_val = m.group(1)
-                # Check if this is actually SSD/storage
-                if not re.search(rf'{ram_val}\s*(?:gb|tb)\s*(?:ssd|storage|depolama)', tl, re.IGNORECASE):
-                    info['ram'] = f"{ram_val}GB"
-                    break
+        # RAM - core.specs ortak ayrıştırıcısı (VRAM ve SSD boyutlarını atlar)
+        ram_gb = specs.ram_gb_from_text(title)
+        if ram_gb:
+            info['ram'] = f"{ram_gb}GB"
 
         if not info['ram']:
             # Default based on CPU tier
@@ -758,10 +650,8 @@ class AmazonLaptopScraper:
         df['gpu'] = df['gpu'].apply(_normalize_gpu)
         df['cpu'] = df['cpu'].apply(_normalize_cpu)
 
-        # Not: kodunda zaten 3 parametreli _normalize_os(name, os_field, brand_guess) var.
-        # Onu kullanmak için:
         df['os'] = df.apply(
-            lambda r: _normalize_os_compat(r['name'], r['os'], _brand_from_name(r['name'])),
+            lambda r: _normalize_os(r['name'], r['os'], _brand_from_name(r['name'])),
             axis=1
         )
         # -------------------------------------------
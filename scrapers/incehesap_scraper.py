@@ -13,6 +13,7 @@
 #     kırılmadan veri toplamaya çalışır.
 
 import re
+import sys
 import time
 import math
 import random
@@ -25,6 +26,12 @@ from bs4 import BeautifulSoup
 import pandas as pd
 from pathlib import Path
 
+# core paketini script olarak çalıştırırken de bulabilmek için proje kökü
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+from core import specs
+
 # ------------------------------------------------------------------------------
 # AYARLAR
 # ------------------------------------------------------------------------------
@@ -236,48 +243,6 @@ def _extract_brand_model(title: str) -> Tuple[str, str]:
     return brand_norm, model
 
 
-def _parse_gb(text: str) -> Optional[int]:
-    if not text:
-        return None
-    m = re.search(r"(\d+)\s*GB", text, re.I)
-    if m:
-        try:
-            return int(m.group(1))
-        except:
-            return None
-    return None
-
-
-def _parse_screen_inches(text: str) -> Optional[float]:
-    """
-    Düzeltilmiş ekran boyutu parse'ı:
-    - Sadece ondalıklı sayıları (15.6, 16.0) veya açık birim içerenleri kabul et
-    - 10-19.5 aralığı dışındakileri None yap
-    """
-    if not text:
-        return None
-
-    # Önce açık birim olanları ara: "15.6''", '15.6"', "15.6 inç", "15.6 inch"
-    m = re.search(r"(\d{2}(?:[.,]\d)?)\s*(?:\"|''|inç|inch)", text, re.I)
-
-    # Açık birim yoksa, sadece ondalıklı sayıları kabul et (15.6, 16.0 gibi)
-    if not m:
-        m = re.search(r"(\d{2}[.,]\d)", text)
-
-    if m:
-        v = m.group(1).replace(",", ".")
-        try:
-            screen_size = float(v)
-            # Makul ekran boyutu aralığı: 10-19.5 inç
-            if 10.0 <= screen_size <= 19.5:
-                return screen_size
-            else:
-                return None
-        except:
-            return None
-    return None
-
-
 def _parse_cpu(text: str) -> str:
     if not text:
         return ""
@@ -330,61 +295,6 @@ def _parse_gpu(text: str) -> str:
     return ""
 
 
-def _parse_storage(text: str) -> Optional[int]:
-    """
-    Düzeltilmiş depolama parse'ı:
-    - Makul aralık kontrolü: 64-12288 GB
-    """
-    if not text:
-        return None
-    m = re.search(r"(\d+)\s*TB", text, re.I)
-    if m:
-        try:
-            storage_gb = int(m.group(1)) * 1024
-            # Makul depolama aralığı kontrolü
-            if 64 <= storage_gb <= 12288:
-                return storage_gb
-            else:
-                return None
-        except:
-            pass
-    m = re.search(r"(\d{3,4})\s*GB", text, re.I)
-    if m:
-        try:
-            storage_gb = int(m.group(1))
-            # Makul depolama aralığı kontrolü
-            if 64 <= storage_gb <= 12288:
-                return storage_gb
-            else:
-                return None
-        except:
-            pass
-    return None
-
-
-def _parse_os(text: str) -> str:
-    """
-    Düzeltilmiş işletim sistemi parse'ı:
-    - W11, W11P, W11 Pro varyantlarını yakala
-    """
-    if not text:
-        return ""
-
-    text_norm = _normalize_turkish(text)
-
-    if re.search(r"Free\s?DOS|Freedos", text_norm, re.I):
-        return "FreeDOS"
-    elif re.search(r"Windows\s?11|Win11|\bW11(?:P|Pro)?\b", text_norm, re.I):
-        return "Windows 11"
-    elif re.search(r"Windows\s?10|Win10|\bW10\b", text_norm, re.I):
-        return "Windows 10"
-    elif re.search(r"Mac\s?OS|macOS|Sonoma|Ventura|Monterey", text_norm, re.I):
-        return "macOS"
-    elif re.search(r"Ubuntu|Linux", text_norm, re.I):
-        return "Linux"
-
-    return ""
-
 
 def _guess_stock(texts: List[str]) -> str:
     """Basit stok çıkarımı: 'Tükendi', 'Stokta var', 'Aynı gün kargo' vb."""
@@ -695,10 +605,10 @@ class InceHesapLaptopScraper:
 
         cpu = _parse_cpu(title_or_specs)
         gpu = _parse_gpu(title_or_specs)
-        ram_gb = _parse_gb(title_or_specs)
-        storage_gb = _parse_storage(title_or_specs)
-        screen_inch = _parse_screen_inches(title_or_specs)
-        os_val = _parse_os(title_or_specs)
+        ram_gb = specs.ram_gb_from_text(title_or_specs)
+        storage_gb = specs.ssd_gb_from_text(title_or_specs)
+        screen_inch = specs.screen_inches_from_text(title_or_specs)
+        os_val = specs.os_label_from_text(title_or_specs, default="")
 
         return {
             "product_url": url,
@@ -1,4 +1,6 @@
+import os
 import re
+import sys
 import time
 from datetime import datetime
 
@@ -14,6 +16,12 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from typing import Optional
 
+# Make the project root importable when this file is run as a script.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+from core import specs  # noqa: E402
+
 LOAD_MORE_LOCATORS = [
     (By.CSS_SELECTOR, "button[data-test*='load-more']"),
     (By.CSS_SELECTOR, "button[data-test*='loadMore']"),
@@ -184,35 +192,15 @@ def parse_cpu(name: str, specs_text: Optional[str] = None) -> Optional[str]:
 
 
 def parse_os(name: str, specs_text: Optional[str] = None) -> Optional[str]:
-    """Derive OS from specs first, then name heuristics."""
-    def normalize_os(os_str: str) -> Optional[str]:
-        os_low = os_str.lower()
-        if any(x in os_low for x in ["windows 11", "win11", "w11"]):
-            return "Windows 11"
-        if any(x in os_low for x in ["windows 10", "win10", "w10"]):
-            return "Windows 10"
-        if "freedos" in os_low or "free dos" in os_low:
-            return "FreeDOS"
-        if "chrome" in os_low:
-            return "ChromeOS"
-        if "linux" in os_low or "ubuntu" in os_low:
-            return "Linux"
-        if "macos" in os_low or "mac os" in os_low or "macbook" in os_low or re.search(r"m\d", os_low):
-            return "macOS"
-        return None
-
+    """Derive OS from the specs' OS label first, then from the name."""
     if specs_text:
         hint = _extract_after_label(specs_text, ["isletim sistemi", "operating system"])
         if hint:
-            parsed = normalize_os(hint)
+            parsed = specs.os_label_from_text(hint)
             if parsed:
                 return parsed
 
-    os_from_name = normalize_os(name)
-    if os_from_name:
-        return os_from_name
-
-    return None
+    return specs.os_label_from_text(name)
 
 
 def normalize_gpu(name: str, gpu_raw: str) -> str:
@@ -371,53 +359,17 @@ def extract_gpu(name):
 
 def extract_ram(name):
     """Extract RAM information."""
-    name_lower = name.lower()
-    match = re.search(r"(\d+)\s*gb\s*(?:ram|ddr)", name_lower)
-    if not match:
-        match = re.search(r"(\d+)gb", name_lower)
-    if match:
-        return f"{match.group(1)}GB"
-    return "8GB"
+    return f"{specs.ram_gb_from_text(name, default=8)}GB"
 
 
 def extract_ssd(name):
     """Extract SSD size information."""
-    name_lower = name.lower()
-
-    tb_match = re.search(r"(\d+)\s*tb", name_lower)
-    if tb_match:
-        return f"{int(tb_match.group(1)) * 1024}GB"
-
-    gb_match = re.search(r"(\d{3,4})\s*gb", name_lower)
-    if gb_match:
-        size = int(gb_match.group(1))
-        if size >= 128:
-            return f"{size}GB"
-
-    return "512GB"
+    return f"{specs.ssd_gb_from_text(name, default=512)}GB"
 
 
 def extract_screen_size(name):
     """Extract screen size."""
-    name_lower = name.lower()
-    patterns = [
-        r'(\d{2}[\.,]\d)"',
-        r'(\d{2})"',
-        r"(\d{2}[\.,]\d)\s*(?:inch|inç)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, name_lower)
-        if match:
-            size = match.group(1).replace(",", ".")
-            return f'{size}"'
-
-    return '15.6"'
-
-
-def extract_os(name):
-    """Backward-compatible OS extractor; delegates to parse_os."""
-    return parse_os(name)
+    return f'{specs.screen_inches_from_text(name, default=15.6)}"'
 
 
 def scrape_mediamarkt():
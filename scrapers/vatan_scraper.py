@@ -1,10 +1,18 @@
 import requests
 from bs4 import BeautifulSoup
 import csv
+import os
 import re
+import sys
 import time
 from urllib.parse import urljoin
 
+# core paketini script olarak çalıştırırken de bulabilmek için proje kökü
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+from core import specs
+
 
 class VatanLaptopScraper:
     def __init__(self):
@@ -55,70 +63,13 @@ class VatanLaptopScraper:
         return None
 
     def extract_screen_size(self, name, specs_text):
-        """Ekran boyutunu extract et - İyileştirilmiş versiyon"""
-        text = f"{name} {specs_text}"
-
-        # Önce açık "inç/inc/inch" ifadelerini ara (en güvenilir)
-        match = re.search(r'(\d{2}[\.,]?\d?)\s*(?:inç|inc|inch|"|\'\')', text, re.IGNORECASE)
-        if match:
-            size = match.group(1).replace(',', '.')
-            try:
-                size_float = float(size)
-                if 10.0 <= size_float <= 19.5:
-                    return f'{size_float}"'
-            except:
-                pass
-
-        # Fallback: Sadece rakam ama "Nesil" kelimesinden sonra gelmesin
-        # "13.Nesil" veya "12.Nesil" gibi ifadeleri atla
-        for match in re.finditer(r'(\d{2}[\.,]?\d?)', text):
-            # Öncesinde "Nesil" varsa atla
-            start = max(0, match.start() - 10)
-            context = text[start:match.start()].lower()
-            if 'nesil' in context or 'gen' in context:
-                continue
-
-            size = match.group(1).replace(',', '.')
-            try:
-                size_float = float(size)
-                # 13" ve üstü kabul et (12.Nesil karışıklığını önler)
-                if 13.0 <= size_float <= 19.5:
-                    return f'{size_float}"'
-            except:
-                pass
-
-        return '15.6"'  # Varsayılan
+        """Ekran boyutunu extract et (core.specs ortak ayrıştırıcısı)"""
+        size = specs.screen_inches_from_text(f"{name} {specs_text}", default=15.6)
+        return f'{size}"'
 
     def extract_ssd(self, name, specs_text):
         """SSD kapasitesini extract et - String formatında"""
-        text = f"{name} {specs_text}"
-
-        # TB kontrolü (1TB, 2TB vb.)
-        tb_match = re.search(r'(\d+)\s*TB\s*(?:SSD|ssd|NVMe|nvme)?', text, re.IGNORECASE)
-        if tb_match:
-            size = int(tb_match.group(1)) * 1024
-            if size in [1024, 2048, 4096]:
-                return f"{size}GB"
-
-        # GB kontrolü (512GB, 1024GB vb.)
-        gb_match = re.search(r'(\d+)\s*GB\s*(?:SSD|ssd|NVMe|nvme)', text, re.IGNORECASE)
-        if gb_match:
-            size = int(gb_match.group(1))
-            if size in [128, 256, 512, 1024, 2048, 4096]:
-                return f"{size}GB"
-
-        # Alternatif: "1000GB" -> "1024GB" dönüşümü
-        storage_match = re.search(r'(\d+)\s*GB', text, re.IGNORECASE)
-        if storage_match:
-            num = int(storage_match.group(1))
-            if num == 1000:
-                return "1024GB"
-            elif num == 500:
-                return "512GB"
-            elif num in [128, 256, 512, 1024, 2048, 4096]:
-                return f"{num}GB"
-
-        return "512GB"  # Varsayılan
+        return f"{specs.ssd_gb_from_text(f'{name} {specs_text}', default=512)}GB"
 
     def extract_cpu(self, name, specs_text):
         """CPU modelini extract et - İyileştirilmiş versiyon"""
@@ -212,73 +163,11 @@ class VatanLaptopScraper:
 
     def extract_ram(self, name, specs_text):
         """RAM kapasitesini GB cinsinden döndür (GPU VRAM hariç)."""
-        text = f"{name} {specs_text}"
-        text_lower = text.lower()
-
-        # GPU VRAM ifadelerini temizle (ör: "rtx4050 6gb", "gddr6 8gb", "8gb vram")
-        cleaned = re.sub(
-            r'(?:rtx|gtx|rx|arc|mx)[\w\s\-]*?\b\d+\s*gb',
-            ' ',
-            text_lower,
-            flags=re.IGNORECASE
-        )
-        cleaned = re.sub(r'gddr\d?\s*\d+\s*gb', ' ', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\b\d+\s*gb\s*vram\b', ' ', cleaned, flags=re.IGNORECASE)
+        return f"{specs.ram_gb_from_text(f'{name} {specs_text}', default=8)}GB"
 
-        candidates = []
-        for match in re.finditer(r'(\d+)\s*gb', cleaned, re.IGNORECASE):
-            try:
-                value = int(match.group(1))
-            except ValueError:
-                continue
-
-            if not (4 <= value <= 192):
-                continue
-
-            start, end = match.span()
-            remainder = cleaned[end:]
-            if re.match(r'\s*(?:ssd|emmc|ufs|nvme|hdd|storage)', remainder):
-                continue
-            prefix = cleaned[max(0, start - 10):start]
-            if re.search(r'(?:ssd|emmc|ufs|nvme|hdd|storage)\s*$', prefix):
-                continue
-
-            candidates.append(value)
-
-        if candidates:
-            return f"{max(candidates)}GB"
-
-        return "8GB"  # Varsayılan
-
     def extract_os(self, name, specs_text):
-        """İşletim sistemini extract et"""
-        text = f"{name} {specs_text}".lower()
-
-        # Windows versiyonları
-        if 'windows 11' in text or 'win11' in text or 'w11' in text:
-            return "Windows 11"
-        elif 'windows 10' in text or 'win10' in text or 'w10' in text:
-            return "Windows 10"
-        elif 'windows' in text:
-            return "windows"
-
-        # FreeDOS
-        elif any(x in text for x in ['freedos', 'free dos', 'dos', 'fdos']):
-            return "FreeDOS"
-
-        # macOS
-        elif any(x in text for x in ['macbook', 'macos', 'mac os']):
-            return "macOS"
-
-        # Linux
-        elif 'linux' in text or 'ubuntu' in text:
-            return "linux"
-
-        # Apple ürünü kontrolü (marka bazlı)
-        if 'apple' in text or 'macbook' in text or 'mac pro' in text:
-            return "macOS"
-
-        return "FreeDOS"  # Varsayılan
+        """İşletim sistemini extract et (bulunamazsa FreeDOS)"""
+        return specs.os_label_from_text(f"{name} {specs_text}", default="FreeDOS")
 
     def extract_gpu(self, name, specs_text):
         """GPU modelini extract et - Standart format"""
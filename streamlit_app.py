@@ -1,35 +1,59 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 from typing import Any, Dict
 
-from core.data_io import load_data, clean_data
 from core import scoring
+from core.bitmap import BitmapIndex
+from core.catalog import load_prepared_catalog
 
 
-@st.cache_data
+@st.cache_resource
 def load_prepared_data() -> pd.DataFrame:
     """
-    Load, clean, and enrich the laptop dataset with score columns.
+    Load the prepared (cleaned and scored) catalog, rebuilding it when stale.
+
+    Cached as a shared resource: every session reads the same memory-mapped
+    frame, so it must not be modified in place.
     """
-    df = load_data(use_cache=True)
-    if df is None or df.empty:
-        return pd.DataFrame()
+    return load_prepared_catalog()
 
-    df = clean_data(df)
 
-    if "cpu" in df.columns:
-        df["cpu_score"] = df["cpu"].apply(scoring.get_cpu_score)
-    else:
-        df["cpu_score"] = 5.0
+@st.cache_resource
+def load_filter_index() -> BitmapIndex:
+    """
+    Bitmap index over the prepared catalog, shared like the catalog itself.
 
-    if "gpu" in df.columns:
-        df["gpu_norm"] = df["gpu"].apply(scoring.normalize_gpu_model)
-        df["gpu_score"] = df["gpu_norm"].apply(scoring.get_gpu_score)
-    else:
-        df["gpu_score"] = 3.0
-        df["gpu_norm"] = "Integrated (generic)"
+    Brand/OS/RAM/SSD/usage vectors are built once per process; each rerun only
+    combines them.
+    """
+    return scoring.build_filter_index(load_prepared_data())
+
+
+def sidebar_mask(index: BitmapIndex, preferences: Dict[str, Any]) -> np.ndarray:
+    """
+    Combine the advanced sidebar filters into one row vector over the catalog.
+    """
+    mask = index.all()
+    allowed_brands = preferences.get("allowed_brands")
+    if allowed_brands:
+        mask = mask & index.isin("brand", allowed_brands)
+
+    allowed_oses = preferences.get("allowed_oses")
+    if allowed_oses:
+        mask = mask & index.isin("os", allowed_oses)
+
+    min_ram = preferences.get("min_ram")
+    if min_ram:
+        mask = mask & index.at_least("ram_gb", min_ram)
 
-    return df
+    min_ssd = preferences.get("min_ssd")
+    if min_ssd:
+        mask = mask & index.at_least("ssd_gb", min_ssd)
+
+    if preferences.get("usage_key") == "gaming" and preferences.get("exclude_apple_in_gaming"):
+        mask = mask & ~index.equals("brand", "apple")
+    return mask
 
 
 def build_preferences(df: pd.DataFrame) -> Dict[str, Any] | None:
@@ -261,6 +285,9 @@ def show_recommendations_streamlit(recs: pd.DataFrame, preferences: Dict[str, An
             score_text = f"{score_val:.1f}/100" if pd.notna(score_val) else "-"
 
             left.write(f"\U0001F4B8 Fiyat: {price_text}")
+            store_count = row.get("store_count", 1)
+            if pd.notna(store_count) and store_count > 1:
+                left.caption(f"{int(store_count)} ma\u011fazada sat\u0131l\u0131yor, en ucuz teklif g\u00f6steriliyor.")
             left.write(f"\u2b50 Toplam skor: {score_text}")
             if preferences.get("show_breakdown") and row.get("score_breakdown"):
                 left.caption(f"Skor detaylar\u0131: {row.get('score_breakdown')}")
@@ -324,29 +351,12 @@ def main():
     if preferences is None:
         st.stop()
 
-    filtered_df = df.copy()
-    allowed_brands = preferences.get("allowed_brands")
-    if allowed_brands:
-        filtered_df = filtered_df[filtered_df["brand"].isin(allowed_brands)]
-
-    allowed_oses = preferences.get("allowed_oses")
-    if allowed_oses:
-        filtered_df = filtered_df[filtered_df["os"].isin(allowed_oses)]
-
-    min_ram = preferences.get("min_ram")
-    if min_ram:
-        filtered_df = filtered_df[filtered_df["ram_gb"] >= min_ram]
-
-    min_ssd = preferences.get("min_ssd")
-    if min_ssd:
-        filtered_df = filtered_df[filtered_df["ssd_gb"] >= min_ssd]
-
-    if preferences.get("usage_key") == "gaming" and preferences.get("exclude_apple_in_gaming"):
-        filtered_df = filtered_df[filtered_df["brand"] != "apple"]
+    index = load_filter_index()
+    mask = sidebar_mask(index, preferences)
 
     if st.sidebar.button("\U0001F680 \u00d6nerileri Hesapla"):
         top_n = preferences.pop("top_n", 5)
-        recs = scoring.get_recommendations(filtered_df, preferences, top_n=top_n)
+        recs = scoring.get_recommendations(df, preferences, top_n=top_n, index=index, mask=mask)
         if recs.empty:
             st.warning("Filtreler \u00e7ok s\u0131k\u0131 olabilir, b\u00fct\u00e7eyi veya ama\u00e7lar\u0131 gev\u015fetmeyi dene.")
         else:
@@ -0,0 +1,104 @@
+from datetime import datetime
+import os
+
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from core import data_io
+from core.history import SCRAPED_AT_FORMAT
+
+
+def _use_data_dir(monkeypatch, data_dir):
+    monkeypatch.setattr(data_io, "DATA_DIR", data_dir)
+    monkeypatch.setattr(data_io, "CACHE_FILE", data_dir / "laptop_cache.parquet")
+    monkeypatch.setattr(data_io, "CACHE_MANIFEST_FILE", data_dir / "laptop_cache.manifest.json")
+
+
+def test_cache_hit_matches_fresh_load_with_text_prices(tmp_path, monkeypatch):
+    _use_data_dir(monkeypatch, tmp_path)
+    pd.DataFrame(
+        {
+            "url": ["https://a.example/1", "https://a.example/2"],
+            "name": ["Lenovo IdeaPad 5 16GB RAM 512GB SSD", "ASUS Vivobook 8GB RAM 256GB SSD"],
+            "price": [8495.0, 21999.0],
+            "ram": [16, 8],
+            "ssd": [512, 256],
+            "os": ["Windows 11", "FreeDOS"],
+        }
+    ).to_csv(tmp_path / "a_laptops.csv", index=False)
+    pd.DataFrame(
+        {
+            "url": ["https://b.example/1", "https://b.example/2"],
+            "name": ["HP Victus 16GB RAM 1TB SSD", "Apple MacBook Air 8GB RAM 256GB SSD"],
+            "price": ["13.999 TL", "42.999 TL"],
+            "ram": ["16 GB", "8 GB"],
+            "ssd": ["1 TB", "256 GB"],
+            "os": ["Windows 11", "macOS"],
+        }
+    ).to_csv(tmp_path / "b_laptops.csv", index=False)
+
+    fresh = data_io.load_data(use_cache=True)
+    assert "from cache" not in data_io.get_last_dataio_status()
+    cached = data_io.load_data(use_cache=True)
+    assert "from cache" in data_io.get_last_dataio_status()
+
+    tm.assert_frame_equal(cached, fresh)
+    tm.assert_frame_equal(data_io.clean_data(cached), data_io.clean_data(fresh))
+    assert sorted(data_io.clean_data(cached)["price"]) == [8495.0, 13999.0, 21999.0, 42999.0]
+
+
+def test_unstorable_values_bypass_the_cache(tmp_path, monkeypatch):
+    _use_data_dir(monkeypatch, tmp_path)
+    frame = pd.DataFrame({"price": pd.Series([1.5, "2 TL", b"3"], dtype=object)})
+
+    assert data_io._write_cache(frame, []) == {}
+    assert not data_io.CACHE_FILE.exists()
+    assert not data_io.CACHE_MANIFEST_FILE.exists()
+
+
+def test_touching_an_unstamped_file_refreshes_its_scraped_at(tmp_path, monkeypatch):
+    _use_data_dir(monkeypatch, tmp_path)
+    unstamped = tmp_path / "a_laptops.csv"
+    stamped = tmp_path / "b_laptops.csv"
+    pd.DataFrame({"name": ["Lenovo IdeaPad 5"], "price": [8495.0]}).to_csv(unstamped, index=False)
+    pd.DataFrame(
+        {"name": ["HP Victus"], "price": [13999.0], "scraped_at": ["2026-10-01 09:00:00"], "source": ["b"]}
+    ).to_csv(stamped, index=False)
+    os.utime(unstamped, (1_790_000_000, 1_790_000_000))
+    os.utime(stamped, (1_790_000_000, 1_790_000_000))
+
+    data_io.load_data(use_cache=True)
+    first_hash = data_io.source_data_hash()
+
+    os.utime(stamped, (1_790_100_000, 1_790_100_000))
+    data_io.load_data(use_cache=True)
+    assert "from cache" in data_io.get_last_dataio_status()
+    assert data_io.source_data_hash() == first_hash
+
+    os.utime(unstamped, (1_790_100_000, 1_790_100_000))
+    reloaded = data_io.load_data(use_cache=True)
+    assert "from cache" not in data_io.get_last_dataio_status()
+    assert data_io.source_data_hash() != first_hash
+    expected = datetime.fromtimestamp(1_790_100_000).strftime(SCRAPED_AT_FORMAT)
+    assert reloaded.loc[reloaded["source"] == "a", "scraped_at"].tolist() == [expected]
+
+
+def test_write_clean_chunks_aligns_columns_to_the_header(tmp_path):
+    output = tmp_path / "clean.csv"
+    chunks = [
+        pd.DataFrame({"name": ["a"], "price": [1.0], "ram_gb": [8]}),
+        pd.DataFrame({"ram_gb": [16], "name": ["b"], "price": [2.0]}),
+        pd.DataFrame({"name": ["c"], "price": [3.0]}),
+    ]
+
+    assert data_io.write_clean_chunks(chunks, output) == 3
+    written = pd.read_csv(output, encoding="utf-8-sig")
+    assert written.columns.tolist() == ["name", "price", "ram_gb"]
+    assert written["name"].tolist() == ["a", "b", "c"]
+    assert written["ram_gb"].tolist()[:2] == [8, 16]
+    assert pd.isna(written["ram_gb"].iloc[2])
+
+    extra = [chunks[0], pd.DataFrame({"name": ["d"], "price": [4.0], "ram_gb": [4], "ssd_gb": [256]})]
+    with pytest.raises(ValueError):
+        data_io.write_clean_chunks(extra, output)
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from core import catalog, distinct, scoring
+
+
+def test_equal_values_of_different_types_are_cached_separately():
+    distinct.clear_distinct_caches()
+    series = pd.Series([1, 1.0, True, "1"], dtype=object)
+
+    result = distinct.map_distinct(series, str, name="tests.str")
+
+    assert result.tolist() == ["1", "1.0", "True", "1"]
+    assert distinct.map_distinct(pd.Series([1.0], dtype=object), str, name="tests.str").tolist() == ["1.0"]
+
+
+def test_score_hardware_drops_caches_of_older_scoring_hashes(monkeypatch):
+    frame = pd.DataFrame({"cpu": ["Intel Core i5-1235U"], "gpu": ["Intel Iris Xe"]})
+
+    monkeypatch.setattr(scoring, "scoring_tables_hash", lambda: "old")
+    catalog.score_hardware(frame.copy())
+    assert any(name.endswith(":old") for name in distinct.distinct_cache_stats())
+
+    monkeypatch.setattr(scoring, "scoring_tables_hash", lambda: "new")
+    catalog.score_hardware(frame.copy())
+    names = [name for name in distinct.distinct_cache_stats() if name.startswith(catalog.SCORING_CACHE_PREFIX)]
+    assert names and all(name.endswith(":new") for name in names)
+
@@ -0,0 +1,51 @@
+import shutil
+
+import pandas as pd
+
+from core import history
+
+
+def _write_snapshots(monkeypatch, tmp_path):
+    monkeypatch.setattr(history, "HISTORY_DIR", tmp_path / "history")
+    rows = pd.DataFrame({"url": ["https://a.example/1", "https://a.example/2"], "price": [100.0, 200.0]})
+    history.write_snapshot(rows, "amazon", "2026-10-01 09:00:00")
+    history.write_snapshot(rows, "amazon", "2026-10-01 18:00:00")
+    return history._partition_dir("amazon", "2026-10-01")
+
+
+def test_compact_history_merges_partition_files(tmp_path, monkeypatch):
+    day_dir = _write_snapshots(monkeypatch, tmp_path)
+
+    assert history.compact_history() == 1
+    assert [part.name for part in day_dir.glob("*.parquet")] == ["compacted-20261001.parquet"]
+    assert len(history.read_history()) == 4
+
+
+def test_compact_history_rerun_after_crash_keeps_row_count(tmp_path, monkeypatch):
+    day_dir = _write_snapshots(monkeypatch, tmp_path)
+    parts = sorted(day_dir.glob("*.parquet"))
+    backup = tmp_path / "backup"
+    backup.mkdir()
+    for part in parts:
+        shutil.copy2(part, backup / part.name)
+
+    history.compact_history()
+    # Simulate a crash after the compacted file was published but before the
+    # merged snapshot files were removed.
+    for part in parts:
+        shutil.copy2(backup / part.name, part)
+
+    assert len(history.read_history()) == 4
+    assert history.compact_history() == 0
+    assert [part.name for part in day_dir.glob("*.parquet")] == ["compacted-20261001.parquet"]
+    assert len(history.read_history()) == 4
+
+    late = pd.DataFrame({"url": ["https://a.example/3"], "price": [300.0]})
+    history.write_snapshot(late, "amazon", "2026-10-01 21:00:00")
+    assert history.compact_history() == 1
+    assert len(history.read_history()) == 5
+    assert history.stored_snapshots() == {
+        ("amazon", "2026-10-01 09:00:00"),
+        ("amazon", "2026-10-01 18:00:00"),
+        ("amazon", "2026-10-01 21:00:00"),
+    }